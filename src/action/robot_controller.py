@@ -6,14 +6,63 @@ Based on: https://github.com/tfoldi/go2-webrtc
 """
 
 import asyncio
-import json
-from typing import Any, Callable, Dict, Optional
+import functools
+import math
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
+from src.utils.compat import JSONDecodeError, dumps_str, loads
 from src.utils.logger import log
 
 
+
+def _requires_connection(method):
+    """Skip a command before any frame is built when the body isn't connected."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if not self._connected:
+            # Not an error - Rex can work without body
+            log("Body not connected - movement command ignored", "DEBUG")
+            return False
+        return await method(self, *args, **kwargs)
+    return wrapper
+
+
+def _clamp_scale(value: float, scale: float) -> float:
+    """Clamp a velocity to [-1, 1] and scale it (inline compares, no min/max calls)."""
+    if value < -1.0:
+        return -scale
+    if value > 1.0:
+        return scale
+    return value * scale
+
+
+# Pre-encoded fragments of a move frame: {"cmd":1008,"data":{"x":..,"y":..,"yaw":..}}
+_MOVE_PREFIX = '{"cmd":1008,"data":{"x":'
+_MOVE_Y = ',"y":'
+_MOVE_YAW = ',"yaw":'
+_MOVE_SUFFIX = '}}'
+
+
+def _encode_move(velocity_x: float, velocity_y: float, velocity_yaw: float) -> str:
+    """
+    Encode a move frame.
+    
+    The schema is fixed, so the frame is concatenated from pre-encoded
+    fragments instead of going through a dict and the JSON encoder.
+    
+    Velocities must be finite (JSON has no NaN/inf); repr() keeps them exact.
+    """
+    return "".join((
+        _MOVE_PREFIX, repr(float(velocity_x)),
+        _MOVE_Y, repr(float(velocity_y)),
+        _MOVE_YAW, repr(float(velocity_yaw)),
+        _MOVE_SUFFIX
+    ))
+
+
 class RobotMode(Enum):
     """Available robot modes."""
     NORMAL = "normal"
@@ -21,6 +70,10 @@ class RobotMode(Enum):
     STAIRS = "stairs"
 
 
+# O(1) lookup for telemetry, no ValueError for unknown modes
+_MODE_BY_VALUE = {mode.value: mode for mode in RobotMode}
+
+
 class GestureType(Enum):
     """Available gestures/tricks."""
     STAND = "stand"
@@ -33,7 +86,7 @@ class GestureType(Enum):
     HEART = "heart"  # Heart mode
 
 
-@dataclass
+@dataclass(slots=True)
 class RobotState:
     """Current state of the robot."""
     battery_percent: float = 100.0
@@ -53,10 +106,14 @@ class RobotController:
     """
     
     # Command IDs for Go2 WebRTC protocol
-    CMD_MOVE = 1008  # Move command
+    CMD_MOVE = 1008  # Move command (also hardcoded in _MOVE_PREFIX)
     CMD_MODE = 1017  # Change mode
     CMD_GESTURE = 1009  # Trigger gesture
     
+    # look_at tuning
+    LOOK_AT_DEADZONE = 0.1  # Offsets below this are "already looking at it"
+    LOOK_AT_DEBOUNCE = 0.2  # Seconds between two look_at turns
+    
     def __init__(
         self,
         config: Dict[str, Any],
@@ -75,6 +132,7 @@ class RobotController:
         
         self._connected = False
         self._state = RobotState()
+        self._dispatch_scheduled = False  # A state callback is pending
         
         # WebRTC connection (will be initialized on connect)
         self._pc = None  # RTCPeerConnection
@@ -85,6 +143,29 @@ class RobotController:
         self._max_speed = action_config.get("max_speed", 0.5)
         self._rotation_speed = action_config.get("rotation_speed", 0.8)
         self._obstacle_avoidance = action_config.get("obstacle_avoidance", True)
+        self._command_rate = action_config.get("command_rate_hz", 50)
+        
+        # Latest-value-wins mailbox drained by a single sender task, so a burst
+        # of move() calls results in one frame per send interval
+        self._move_mailbox: Optional[Tuple[float, float, float]] = None
+        self._move_event = asyncio.Event()
+        self._sender_task: Optional[asyncio.Task] = None
+        
+        # look_at debouncing: one turn in flight, newer targets replace older
+        self._turn_task: Optional[asyncio.Task] = None
+        self._last_turn_ts = 0.0
+        self._pending_look: Optional[float] = None
+        
+        # Pre-encoded frames for commands that never change
+        self._stop_frame = dumps_str({"cmd": self.CMD_MOVE, "data": {"x": 0, "y": 0, "yaw": 0}})
+        self._gesture_frames = {
+            gesture: dumps_str({"cmd": self.CMD_GESTURE, "data": {"gesture": gesture.value}})
+            for gesture in GestureType
+        }
+        self._mode_frames = {
+            mode: dumps_str({"cmd": self.CMD_MODE, "data": {"mode": mode.value}})
+            for mode in RobotMode
+        }
         
     @property
     def is_connected(self) -> bool:
@@ -137,6 +218,8 @@ class RobotController:
             
             log("Robot connection established!", "SUCCESS")
             self._connected = True
+            if self._sender_task is None or self._sender_task.done():
+                self._sender_task = asyncio.create_task(self._command_sender_loop())
             return True
             
         except Exception as e:
@@ -146,56 +229,111 @@ class RobotController:
             
     async def disconnect(self):
         """Disconnect from the robot."""
+        if self._turn_task:
+            self._turn_task.cancel()
+            self._turn_task = None
+        if self._sender_task:
+            self._sender_task.cancel()
+            self._sender_task = None
+        self._move_mailbox = None
         if self._pc:
             await self._pc.close()
         self._connected = False
         log("Disconnected from robot", "INFO")
         
-    def _handle_message(self, message: str):
-        """Handle incoming message from robot."""
+    def _handle_message(self, message):
+        """Handle incoming message from robot (str or bytes)."""
+        # Most frames are telemetry we don't use - skip parsing them
+        raw = message.encode("utf-8") if isinstance(message, str) else message
+        if b'"battery"' not in raw and b'"mode"' not in raw:
+            return
+            
         try:
-            data = json.loads(message)
+            data = loads(raw)
             
             # Update state based on message type
             if "battery" in data:
                 self._state.battery_percent = data["battery"]
                 
             if "mode" in data:
-                try:
-                    self._state.mode = RobotMode(data["mode"])
-                except ValueError:
-                    pass
+                mode = _MODE_BY_VALUE.get(data["mode"])
+                if mode is not None:
+                    self._state.mode = mode
                     
             if self._on_state_change:
-                self._on_state_change(self._state)
+                self._schedule_state_dispatch()
                 
-        except json.JSONDecodeError:
-            pass
+        except (JSONDecodeError, TypeError):
+            pass  # Malformed frame or unexpected field types
+            
+    def _schedule_state_dispatch(self):
+        """Notify state listeners once per loop iteration, however many frames arrived."""
+        if self._dispatch_scheduled:
+            return
+            
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside the event loop - dispatch right away
+            self._flush_state()
+            return
+            
+        self._dispatch_scheduled = True
+        loop.call_soon(self._flush_state)
+        
+    def _flush_state(self):
+        """Invoke the state-change callback with the merged state."""
+        self._dispatch_scheduled = False
+        if self._on_state_change:
+            self._on_state_change(self._state)
             
-    async def _send_command(self, cmd_id: int, data: Dict[str, Any]) -> bool:
+    async def _send_raw(self, frame: str) -> bool:
         """
-        Send a command to the robot.
+        Send an already encoded frame to the robot.
+        
+        Frames are str: the robot expects text DataChannel messages, and
+        aiortc sends bytes as binary ones.
         
         Returns:
-            True if command was sent, False if not connected
+            True if frame was sent, False if not connected
         """
         if not self._connected or not self._dc:
             # Not an error - Rex can work without body
             log("Body not connected - movement command ignored", "DEBUG")
             return False
             
-        message = json.dumps({
-            "cmd": cmd_id,
-            "data": data
-        })
-        
         try:
-            self._dc.send(message)
+            self._dc.send(frame)
             return True
         except Exception as e:
             log(f"Failed to send command: {e}", "ERROR")
             return False
             
+    async def _command_sender_loop(self):
+        """Send the latest queued move, at most once per send interval."""
+        interval = 1.0 / self._command_rate
+        while True:
+            await self._move_event.wait()
+            self._move_event.clear()
+            
+            velocities = self._move_mailbox
+            self._move_mailbox = None
+            if velocities is not None:
+                await self._send_raw(_encode_move(*velocities))
+                
+            await asyncio.sleep(interval)
+            
+    async def _queue_move(self, velocity_x: float, velocity_y: float, velocity_yaw: float):
+        """Queue a move for the sender task (superseded moves are dropped)."""
+        if self._sender_task is None:
+            # No sender running (not connected) - let _send_raw handle it
+            await self._send_raw(_encode_move(velocity_x, velocity_y, velocity_yaw))
+            return
+            
+        self._move_mailbox = (velocity_x, velocity_y, velocity_yaw)
+        self._move_event.set()
+        
+    @_requires_connection
     async def move(
         self,
         velocity_x: float = 0.0,
@@ -212,18 +350,18 @@ class RobotController:
             velocity_yaw: Rotation velocity (-1 to 1)
             duration: Duration in seconds (0 = continuous)
         """
+        if not (math.isfinite(velocity_x) and math.isfinite(velocity_y) and math.isfinite(velocity_yaw)):
+            log(f"Invalid move ignored: x={velocity_x}, y={velocity_y}, yaw={velocity_yaw}", "ERROR")
+            return False
+            
         # Clamp velocities
-        velocity_x = max(-1, min(1, velocity_x)) * self._max_speed
-        velocity_y = max(-1, min(1, velocity_y)) * self._max_speed
-        velocity_yaw = max(-1, min(1, velocity_yaw)) * self._rotation_speed
+        velocity_x = _clamp_scale(velocity_x, self._max_speed)
+        velocity_y = _clamp_scale(velocity_y, self._max_speed)
+        velocity_yaw = _clamp_scale(velocity_yaw, self._rotation_speed)
         
         log(f"Move: x={velocity_x:.2f}, y={velocity_y:.2f}, yaw={velocity_yaw:.2f}", "ROBOT")
         
-        await self._send_command(self.CMD_MOVE, {
-            "x": velocity_x,
-            "y": velocity_y,
-            "yaw": velocity_yaw
-        })
+        await self._queue_move(velocity_x, velocity_y, velocity_yaw)
         
         self._state.is_moving = True
         self._state.velocity_x = velocity_x
@@ -235,13 +373,12 @@ class RobotController:
             await asyncio.sleep(duration)
             await self.stop()
             
+    @_requires_connection
     async def stop(self):
         """Stop all movement."""
-        await self._send_command(self.CMD_MOVE, {
-            "x": 0,
-            "y": 0,
-            "yaw": 0
-        })
+        # Drop any queued move so it can't be sent after the stop
+        self._move_mailbox = None
+        await self._send_raw(self._stop_frame)
         
         self._state.is_moving = False
         self._state.velocity_x = 0
@@ -267,6 +404,24 @@ class RobotController:
         
         await self.move(velocity_yaw=yaw, duration=turn_time)
         
+    async def walk(self, distance: float):
+        """
+        Walk straight, forward or backward.
+        
+        Args:
+            distance: Distance in meters (negative = backward)
+        """
+        if not distance:
+            return
+            
+        # Approximate time to walk at full speed (max_speed m/s)
+        walk_time = abs(distance) / self._max_speed
+        
+        log(f"Walking {distance} m", "ROBOT")
+        
+        await self.move(velocity_x=1.0 if distance > 0 else -1.0, duration=walk_time)
+        
+    @_requires_connection
     async def set_mode(self, mode: RobotMode):
         """
         Set the robot mode.
@@ -276,12 +431,11 @@ class RobotController:
         """
         log(f"Setting mode: {mode.value}", "ROBOT")
         
-        await self._send_command(self.CMD_MODE, {
-            "mode": mode.value
-        })
+        await self._send_raw(self._mode_frames[mode])
         
         self._state.mode = mode
         
+    @_requires_connection
     async def do_gesture(self, gesture: GestureType):
         """
         Perform a gesture/trick.
@@ -291,9 +445,7 @@ class RobotController:
         """
         log(f"Doing gesture: {gesture.value}", "ROBOT")
         
-        await self._send_command(self.CMD_GESTURE, {
-            "gesture": gesture.value
-        })
+        await self._send_raw(self._gesture_frames[gesture])
         
     async def stand(self):
         """Make the robot stand up."""
@@ -334,16 +486,39 @@ class RobotController:
         """
         Turn to look at a specific position relative to current orientation.
         
+        Returns immediately: the turn runs in the background, and offsets
+        received while it runs are coalesced into a single follow-up turn.
+        
         Args:
             x_offset: Horizontal offset (-1 to 1, where 0 is center)
             y_offset: Vertical offset (not really used for Go2)
         """
-        # Convert x_offset to turn direction and amount
-        if abs(x_offset) < 0.1:
+        if self._turn_task is not None and not self._turn_task.done():
+            # Still turning - only keep the latest target
+            self._pending_look = x_offset
+            return
+            
+        if abs(x_offset) < self.LOOK_AT_DEADZONE:
             return  # Already looking roughly at target
             
-        direction = "left" if x_offset < 0 else "right"
-        angle = abs(x_offset) * 30  # Max 30 degrees adjustment
-        
-        await self.turn(direction, angle)
-
+        if time.monotonic() - self._last_turn_ts < self.LOOK_AT_DEBOUNCE:
+            return  # Just turned - let the image settle
+            
+        self._turn_task = asyncio.create_task(self._turn_towards(x_offset))
+        
+    async def _turn_towards(self, x_offset: float):
+        """Turn towards an offset, then towards the latest pending one."""
+        while x_offset is not None and abs(x_offset) >= self.LOOK_AT_DEADZONE:
+            # Convert x_offset to turn direction and amount
+            direction = "left" if x_offset < 0 else "right"
+            angle = abs(x_offset) * 30  # Max 30 degrees adjustment
+            
+            await self.turn(direction, angle)
+            self._last_turn_ts = time.monotonic()
+            
+            # Offsets measured while rotating are stale: let the image settle
+            # and only follow up on one measured after that
+            self._pending_look = None
+            await asyncio.sleep(self.LOOK_AT_DEBOUNCE)
+            
+            x_offset, self._pending_look = self._pending_look, None
@@ -4,14 +4,142 @@ Uses direct HTTP calls to OpenAI TTS API (no SDK needed for Android compatibilit
 """
 
 import asyncio
+import functools
+import hashlib
+import os
 import tempfile
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Iterator, List, Optional
 from pathlib import Path
 
 import httpx
 
+from src.utils.compat import HTTP2_AVAILABLE
 from src.utils.config import get_api_key
-from src.utils.logger import log
+from src.utils.logger import log, log_exception
+
+# Resolve the CA bundle once - fallback to unverified for Android
+try:
+    import certifi
+    _VERIFY = certifi.where()
+except Exception:
+    _VERIFY = False
+
+# Keep the TLS connection to OpenAI warm between utterances
+_CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=4, keepalive_expiry=120.0)
+
+
+class _AudioStream:
+    """
+    Audio bytes of a TTS response, readable while they are still downloading.
+    
+    A single producer thread feeds chunks; consumers can either iterate
+    chunks as they arrive or wait for the complete payload.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._done = False
+        self._cond = threading.Condition()
+        self.error: Optional[Exception] = None
+        
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "_AudioStream":
+        """Create an already complete stream."""
+        stream = cls()
+        stream.feed(data)
+        stream.finish()
+        return stream
+        
+    @property
+    def size(self) -> int:
+        """Number of bytes received so far."""
+        with self._cond:
+            return sum(len(c) for c in self._chunks)
+        
+    def feed(self, chunk: bytes):
+        """Append a chunk (producer side)."""
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+            
+    def finish(self, error: Optional[Exception] = None):
+        """Mark the download as complete (producer side)."""
+        with self._cond:
+            self._done = True
+            self.error = error
+            self._cond.notify_all()
+            
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Yield chunks as they arrive (blocking - use from a worker thread)."""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self._chunks) and not self._done:
+                    self._cond.wait()
+                if index >= len(self._chunks):
+                    return
+                chunk = self._chunks[index]
+            index += 1
+            yield chunk
+            
+    def read_all(self) -> bytes:
+        """Wait for the download to complete and return all bytes (blocking)."""
+        with self._cond:
+            while not self._done:
+                self._cond.wait()
+            return b"".join(self._chunks)
+
+
+@functools.lru_cache(maxsize=None)
+def _media_player_listeners():
+    """
+    Build the pyjnius MediaPlayer listener classes (Android only).
+    
+    Returns:
+        (PreparedListener, CompletionListener, ErrorListener) classes
+        wrapping a Python callback
+    """
+    from jnius import PythonJavaClass, java_method
+    
+    class PreparedListener(PythonJavaClass):
+        __javainterfaces__ = ['android/media/MediaPlayer$OnPreparedListener']
+        __javacontext__ = 'app'
+        
+        def __init__(self, callback):
+            super().__init__()
+            self._callback = callback
+            
+        @java_method('(Landroid/media/MediaPlayer;)V')
+        def onPrepared(self, mp):
+            self._callback()
+            
+    class CompletionListener(PythonJavaClass):
+        __javainterfaces__ = ['android/media/MediaPlayer$OnCompletionListener']
+        __javacontext__ = 'app'
+        
+        def __init__(self, callback):
+            super().__init__()
+            self._callback = callback
+            
+        @java_method('(Landroid/media/MediaPlayer;)V')
+        def onCompletion(self, mp):
+            self._callback()
+            
+    class ErrorListener(PythonJavaClass):
+        __javainterfaces__ = ['android/media/MediaPlayer$OnErrorListener']
+        __javacontext__ = 'app'
+        
+        def __init__(self, callback):
+            super().__init__()
+            self._callback = callback
+            
+        @java_method('(Landroid/media/MediaPlayer;II)Z')
+        def onError(self, mp, what, extra):
+            self._callback(what, extra)
+            return True  # Handled - don't call OnCompletion
+            
+    return PreparedListener, CompletionListener, ErrorListener
 
 
 class Speaker:
@@ -22,6 +150,17 @@ class Speaker:
     
     API_URL = "https://api.openai.com/v1/audio/speech"
     
+    # OpenAI "pcm" output: raw 16-bit signed little-endian, 24 kHz, mono
+    PCM_SAMPLE_RATE = 24000
+    
+    # Supported response formats: opus (small, hardware-decoded on most
+    # phones), mp3, pcm (no decode at all, played through AudioTrack)
+    RESPONSE_FORMATS = ("opus", "mp3", "pcm")
+    
+    # Speech rate used by estimate_duration()
+    WORDS_PER_MINUTE = 150
+    CHARS_PER_WORD = 6  # Average French word plus the following space
+    
     def __init__(self, config: Dict[str, Any], log_callback=None):
         """
         Initialize speaker.
@@ -43,6 +182,15 @@ class Speaker:
         self.model = self.tts_config.get("model", "tts-1")
         self.voice = self.tts_config.get("voice", "fable")
         self.speed = self.tts_config.get("speed", 0.9)
+        self.response_format = self.tts_config.get("response_format", "opus")
+        if self.response_format not in self.RESPONSE_FORMATS:
+            log(f"Unknown TTS response_format '{self.response_format}', using mp3", "WARNING")
+            self.response_format = "mp3"
+        self._seconds_per_char = 60 / (self.WORDS_PER_MINUTE * self.CHARS_PER_WORD) / self.speed
+        
+        # On-disk cache of generated audio (0 disables it)
+        self._cache_max_bytes = int(self.tts_config.get("cache_max_mb", 50) * 1024 * 1024)
+        self._cache_dir: Optional[Path] = None
         
         # State
         self._is_speaking = False
@@ -50,6 +198,12 @@ class Speaker:
         # Use synchronous client to avoid event loop issues on Android
         self._client: Optional[httpx.Client] = None
         
+        # Android MediaPlayer, created once and reset between utterances
+        self._player = None
+        self._player_listeners = ()  # Keep references so they aren't collected
+        self._player_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._player_waiter: Optional[asyncio.Future] = None
+        
     def _log(self, message: str, level: str = "INFO"):
         """Log a message."""
         log(message, level)
@@ -59,13 +213,12 @@ class Speaker:
     def _get_client(self) -> httpx.Client:
         """Get or create HTTP client (synchronous for Android compatibility)."""
         if self._client is None or self._client.is_closed:
-            # Try with certifi, fallback to unverified for Android
-            try:
-                import certifi
-                self._client = httpx.Client(timeout=30.0, verify=certifi.where())
-            except Exception:
-                # Fallback for Android
-                self._client = httpx.Client(timeout=30.0, verify=False)
+            self._client = httpx.Client(
+                timeout=30.0,
+                verify=_VERIFY,
+                http2=HTTP2_AVAILABLE,
+                limits=_CLIENT_LIMITS
+            )
         return self._client
         
     @property
@@ -100,14 +253,25 @@ class Speaker:
                 
         self._is_speaking = True
         
+        response = None
         try:
+            # Common phrases come back often - replay them from the disk cache
+            cache_file = self._cache_path(text)
+            if cache_file is not None and cache_file.exists():
+                audio_data = await asyncio.to_thread(self._read_cached, cache_file)
+                if audio_data:
+                    self._log(f"🔊 TTS: Cache hit ({len(audio_data)} bytes)", "SUCCESS")
+                    await self._play_audio(_AudioStream.from_bytes(audio_data))
+                    self._is_speaking = False
+                    return True
+                    
             # Use synchronous client to avoid event loop issues on Android
             client = self._get_client()
             
             self._log(f"🔊 TTS: Calling OpenAI API (voice={self.voice}, speed={self.speed})", "INFO")
             
-            # Generate speech using OpenAI TTS API (synchronous call)
-            response = client.post(
+            request = client.build_request(
+                "POST",
                 self.API_URL,
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -118,72 +282,209 @@ class Speaker:
                     "voice": self.voice,
                     "input": text,
                     "speed": self.speed,
-                    "response_format": "mp3"
+                    "response_format": self.response_format
                 }
             )
             
+            # Generate speech using OpenAI TTS API (synchronous call, run in a
+            # worker thread so the event loop keeps running meanwhile). Only
+            # the headers are awaited - the body is streamed below.
+            try:
+                response = await asyncio.to_thread(client.send, request, stream=True)
+            except asyncio.CancelledError:
+                # The worker thread can't be cancelled - close the client to
+                # abort the in-flight request (a new one is created next time)
+                client.close()
+                raise
+            
             if response.status_code != 200:
+                await asyncio.to_thread(response.read)
                 self._log(f"🔊 TTS API error: {response.status_code} - {response.text[:100]}", "ERROR")
+                response.close()
                 self._is_speaking = False
                 return False
             
-            # Get audio data
-            audio_data = response.content
-            self._log(f"🔊 TTS: Got {len(audio_data)} bytes from OpenAI", "SUCCESS")
+            # Download in the background and start playback on the first bytes
+            stream = _AudioStream()
+            threading.Thread(
+                target=self._pump_response,
+                args=(response, stream, cache_file),
+                daemon=True
+            ).start()
             
             # Play audio
-            await self._play_audio(audio_data)
+            await self._play_audio(stream)
             
             self._is_speaking = False
             return True
             
         except asyncio.CancelledError:
             self._log("🔊 TTS: Speech interrupted", "WARNING")
+            if response is not None:
+                response.close()
             self._is_speaking = False
             return False
             
         except Exception as e:
-            import traceback
-            self._log(f"🔊 TTS error: {e}", "ERROR")
-            self._log(f"🔊 TTS traceback: {traceback.format_exc()[:200]}", "ERROR")
+            log_exception(f"🔊 TTS error: {e}", self._log_callback)
             self._is_speaking = False
             return False
             
-    async def _play_audio(self, audio_data: bytes):
+    def _get_cache_dir(self) -> Path:
+        """Get the TTS cache directory (Android cache dir if available)."""
+        if self._cache_dir is None:
+            try:
+                from jnius import autoclass
+                PythonActivity = autoclass('org.kivy.android.PythonActivity')
+                base_dir = Path(PythonActivity.mActivity.getCacheDir().getAbsolutePath())
+            except Exception:
+                base_dir = Path(tempfile.gettempdir())
+            self._cache_dir = base_dir / "rex_tts"
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        return self._cache_dir
+        
+    def _cache_path(self, text: str) -> Optional[Path]:
+        """Get the cache file for a text with the current voice settings."""
+        if self._cache_max_bytes <= 0:
+            return None
+            
+        # blake2b: fast on ARM cores without SHA extensions
+        key = hashlib.blake2b(
+            f"{self.model}|{self.voice}|{self.speed}|{text}".encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        try:
+            return self._get_cache_dir() / f"{key}.{self.response_format}"
+        except OSError as e:
+            log(f"TTS cache unavailable: {e}", "WARNING")
+            self._cache_max_bytes = 0
+            return None
+            
+    def _read_cached(self, cache_file: Path) -> Optional[bytes]:
+        """Read a cached file and mark it as recently used."""
+        try:
+            data = cache_file.read_bytes()
+            os.utime(cache_file)
+            return data
+        except OSError:
+            return None
+            
+    def _store_cached(self, cache_file: Path, audio_data: bytes):
+        """Atomically write a cache entry, then evict the oldest entries."""
+        try:
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_bytes(audio_data)
+            os.replace(tmp_file, cache_file)
+            
+            entries = [
+                (f.stat(), f) for f in cache_file.parent.iterdir()
+                if f.suffix != ".tmp"
+            ]
+            total = sum(st.st_size for st, _ in entries)
+            if total > self._cache_max_bytes:
+                for st, f in sorted(entries, key=lambda e: e[0].st_mtime):
+                    f.unlink()
+                    total -= st.st_size
+                    if total <= self._cache_max_bytes:
+                        break
+        except OSError as e:
+            log(f"TTS cache write failed: {e}", "WARNING")
+            
+    def _pump_response(
+        self,
+        response: httpx.Response,
+        stream: _AudioStream,
+        cache_file: Optional[Path] = None
+    ):
+        """Copy the streamed TTS response into an audio stream (worker thread)."""
+        error = None
+        try:
+            for chunk in response.iter_bytes(65536):
+                stream.feed(chunk)
+        except Exception as e:
+            error = e
+            log(f"TTS download interrupted: {e}", "WARNING")
+        finally:
+            response.close()
+            stream.finish(error)
+            
+        if error is None:
+            log(f"🔊 TTS: Got {stream.size} bytes from OpenAI", "SUCCESS")
+            if cache_file is not None:
+                self._store_cached(cache_file, stream.read_all())
+            
+    async def _play_audio(self, stream: _AudioStream):
         """
         Play audio data through device speakers.
         
         Args:
-            audio_data: MP3 audio data
+            stream: Encoded audio data (may still be downloading)
         """
         try:
-            await self._play_audio_android(audio_data)
+            if self.response_format == "pcm":
+                await self._play_pcm_android(stream)
+            else:
+                await self._play_audio_android(stream)
         except Exception as e:
             log(f"Android playback failed: {e}, trying desktop", "WARNING")
-            await self._play_audio_desktop(audio_data)
+            await self._play_audio_desktop(await asyncio.to_thread(stream.read_all))
             
-    async def _play_audio_android(self, audio_data: bytes):
-        """Play audio on Android using MediaPlayer."""
-        self._log(f"🔊 TTS: Playing audio ({len(audio_data)} bytes)", "INFO")
+    def _open_pipe_source(self, stream: _AudioStream):
+        """
+        Feed audio to MediaPlayer through an in-memory pipe (no temp file).
+        
+        Args:
+            stream: Encoded audio data, written to the pipe as chunks arrive
+            
+        Returns:
+            Read side ParcelFileDescriptor (must stay open while playing)
+        """
         from jnius import autoclass
+        ParcelFileDescriptor = autoclass('android.os.ParcelFileDescriptor')
+        
+        read_pfd, write_pfd = ParcelFileDescriptor.createPipe()
+        write_fd = write_pfd.detachFd()
         
-        # Get Android cache directory
+        def writer():
+            try:
+                with os.fdopen(write_fd, 'wb') as f:
+                    for chunk in stream.iter_chunks():
+                        f.write(chunk)
+            except OSError:
+                pass  # Reader closed early (prepare failed or interrupted)
+                
+        threading.Thread(target=writer, daemon=True).start()
+        return read_pfd
+        
+    def _write_temp_file(self, audio_data: bytes, context) -> Path:
+        """Write audio to a temp file (fallback when the pipe is rejected)."""
         try:
-            PythonActivity = autoclass('org.kivy.android.PythonActivity')
-            context = PythonActivity.mActivity
             cache_dir = context.getCacheDir().getAbsolutePath()
-            temp_file = Path(cache_dir) / "rex_speech.mp3"
+            temp_file = Path(cache_dir) / f"rex_speech.{self.response_format}"
         except Exception as e:
             self._log(f"🔊 TTS: Using fallback temp dir: {e}", "WARNING")
-            temp_file = Path(tempfile.gettempdir()) / "rex_speech.mp3"
-        
-        # Write audio to temp file
+            temp_file = Path(tempfile.gettempdir()) / f"rex_speech.{self.response_format}"
+            
         with open(temp_file, 'wb') as f:
             f.write(audio_data)
+        return temp_file
+        
+    async def _play_audio_android(self, stream: _AudioStream):
+        """Play audio on Android using MediaPlayer."""
+        from jnius import autoclass
+        self._log("🔊 TTS: Playing audio (streaming)", "INFO")
+        
+        AudioManager = autoclass('android.media.AudioManager')
+        
+        try:
+            PythonActivity = autoclass('org.kivy.android.PythonActivity')
+            context = PythonActivity.mActivity
+        except Exception as e:
+            self._log(f"🔊 TTS: No Android context: {e}", "WARNING")
+            context = None
             
         # Maximize system volume for STREAM_MUSIC
         try:
-            AudioManager = autoclass('android.media.AudioManager')
             audio_manager = context.getSystemService("audio")
             max_volume = audio_manager.getStreamMaxVolume(AudioManager.STREAM_MUSIC)
             audio_manager.setStreamVolume(AudioManager.STREAM_MUSIC, max_volume, 0)
@@ -191,37 +492,188 @@ class Speaker:
         except Exception as e:
             self._log(f"🔊 TTS: Could not set volume: {e}", "WARNING")
         
-        # Play with MediaPlayer
-        MediaPlayer = autoclass('android.media.MediaPlayer')
+        # Play with MediaPlayer, streaming the bytes through a pipe
+        player = self._get_player()
+        read_pfd = None
+        temp_file = None
+        try:
+            try:
+                read_pfd = self._open_pipe_source(stream)
+                prepared = await self._prepare_player(player, read_pfd.getFileDescriptor())
+            except Exception as e:
+                self._log(f"🔊 TTS: Pipe source error: {e}", "WARNING")
+                prepared = False
+                
+            if not prepared:
+                # Some devices refuse non-seekable sources - go through the disk
+                self._log("🔊 TTS: Pipe source failed, using temp file", "WARNING")
+                if read_pfd is not None:
+                    read_pfd.close()
+                    read_pfd = None
+                player.reset()
+                audio_data = await asyncio.to_thread(stream.read_all)
+                temp_file = self._write_temp_file(audio_data, context)
+                if not await self._prepare_player(player, str(temp_file)):
+                    raise RuntimeError("MediaPlayer could not prepare audio")
+                    
+            player.setVolume(1.0, 1.0)
+            
+            # Wait for OnCompletion instead of polling isPlaying() over JNI;
+            # the timeout only guards against a callback that never comes
+            duration_ms = player.getDuration()
+            timeout = duration_ms / 1000 + 5.0 if duration_ms > 0 else None
+            finished = self._new_player_waiter()
+            player.start()
+            
+            self._log("🔊 TTS: Playing...", "INFO")
+            
+            try:
+                await asyncio.wait_for(finished, timeout)
+            except asyncio.TimeoutError:
+                self._log("🔊 TTS: No completion callback, stopping playback", "WARNING")
+            finally:
+                self._player_waiter = None
+                
+            self._log("🔊 TTS: Playback finished!", "SUCCESS")
+        finally:
+            # Back to idle (also stops playback if we were interrupted)
+            player.reset()
+            if read_pfd is not None:
+                read_pfd.close()
+                
+            # Clean up temp file
+            if temp_file is not None:
+                try:
+                    temp_file.unlink()
+                except Exception:
+                    pass
+                    
+    def _get_player(self):
+        """Get or create the shared MediaPlayer (codec setup is paid once)."""
+        if self._player is None:
+            from jnius import autoclass
+            MediaPlayer = autoclass('android.media.MediaPlayer')
+            PreparedListener, CompletionListener, ErrorListener = _media_player_listeners()
+            
+            prepared = PreparedListener(lambda: self._resolve_player_waiter(True))
+            completed = CompletionListener(lambda: self._resolve_player_waiter(True))
+            errored = ErrorListener(self._on_player_error)
+            
+            self._player = MediaPlayer()
+            self._player.setOnPreparedListener(prepared)
+            self._player.setOnCompletionListener(completed)
+            self._player.setOnErrorListener(errored)
+            self._player_listeners = (prepared, completed, errored)
+        return self._player
+        
+    def _new_player_waiter(self) -> asyncio.Future:
+        """Create the future the next MediaPlayer callback will resolve."""
+        self._player_loop = asyncio.get_running_loop()
+        self._player_waiter = self._player_loop.create_future()
+        return self._player_waiter
+        
+    def _resolve_player_waiter(self, value: bool):
+        """Resolve the pending player future (called from an Android thread)."""
+        loop, waiter = self._player_loop, self._player_waiter
+        if loop is None or waiter is None:
+            return
+            
+        def resolve():
+            if not waiter.done():
+                waiter.set_result(value)
+                
+        loop.call_soon_threadsafe(resolve)
+        
+    def _on_player_error(self, what: int, extra: int):
+        """MediaPlayer error callback."""
+        log(f"MediaPlayer error: what={what}, extra={extra}", "WARNING")
+        self._resolve_player_waiter(False)
+        
+    async def _prepare_player(self, player, source, timeout: float = 10.0) -> bool:
+        """
+        Set the data source and prepare the player asynchronously.
+        
+        Returns:
+            True if the player is prepared, False on error or timeout
+        """
+        from jnius import autoclass
         AudioManager = autoclass('android.media.AudioManager')
         
-        player = MediaPlayer()
-        player.setDataSource(str(temp_file))
-        player.setAudioStreamType(AudioManager.STREAM_MUSIC)
-        player.setVolume(1.0, 1.0)
-        player.prepare()
-        player.start()
+        prepared = self._new_player_waiter()
         
-        self._log("🔊 TTS: Playing...", "INFO")
+        player.setDataSource(source)
+        player.setAudioStreamType(AudioManager.STREAM_MUSIC)
+        player.prepareAsync()
         
-        # Wait for playback to finish (check more frequently for faster response)
-        while player.isPlaying():
-            await asyncio.sleep(0.05)
+        try:
+            return await asyncio.wait_for(prepared, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._player_waiter = None
             
-        self._log("🔊 TTS: Playback finished!", "SUCCESS")
-        player.release()
+    async def _play_pcm_android(self, stream: _AudioStream):
+        """Play raw PCM on Android with a streaming AudioTrack (no decoder)."""
+        from jnius import autoclass
+        AudioManager = autoclass('android.media.AudioManager')
+        AudioFormat = autoclass('android.media.AudioFormat')
+        AudioTrack = autoclass('android.media.AudioTrack')
+        
+        self._log("🔊 TTS: Playing PCM audio (streaming)", "INFO")
         
-        # Clean up temp file
+        buffer_size = AudioTrack.getMinBufferSize(
+            self.PCM_SAMPLE_RATE,
+            AudioFormat.CHANNEL_OUT_MONO,
+            AudioFormat.ENCODING_PCM_16BIT
+        )
+        track = AudioTrack(
+            AudioManager.STREAM_MUSIC,
+            self.PCM_SAMPLE_RATE,
+            AudioFormat.CHANNEL_OUT_MONO,
+            AudioFormat.ENCODING_PCM_16BIT,
+            buffer_size,
+            AudioTrack.MODE_STREAM
+        )
+        stopped = threading.Event()
+        
+        def write_all():
+            # AudioTrack.write() blocks until the buffer has room; it only
+            # accepts whole 16-bit frames, so carry an odd byte over
+            pending = b""
+            for chunk in stream.iter_chunks():
+                if stopped.is_set():
+                    return
+                data = pending + chunk
+                size = len(data) & ~1
+                pending = data[size:]
+                if size:
+                    track.write(data, 0, size)
+                
         try:
-            temp_file.unlink()
-        except Exception:
-            pass
+            track.play()
+            await asyncio.to_thread(write_all)
+            # Let the last buffer drain before stopping
+            await asyncio.sleep(buffer_size / (self.PCM_SAMPLE_RATE * 2))
+            self._log("🔊 TTS: Playback finished!", "SUCCESS")
+        finally:
+            stopped.set()
+            track.stop()
+            track.release()
             
     async def _play_audio_desktop(self, audio_data: bytes):
         """Play audio on desktop for development/testing."""
         try:
             import io
             import pygame
+            
+            if self.response_format == "pcm":
+                pygame.mixer.init(frequency=self.PCM_SAMPLE_RATE, size=-16, channels=1)
+                sound = pygame.mixer.Sound(buffer=audio_data)
+                channel = sound.play()
+                while channel.get_busy():
+                    await asyncio.sleep(0.1)
+                return
+                
             pygame.mixer.init()
             
             audio_stream = io.BytesIO(audio_data)
@@ -234,7 +686,8 @@ class Speaker:
         except ImportError:
             log("No audio backend available for playback", "WARNING")
             # Simulate playback delay based on audio size
-            await asyncio.sleep(len(audio_data) / 16000)
+            bytes_per_second = self.PCM_SAMPLE_RATE * 2 if self.response_format == "pcm" else 16000
+            await asyncio.sleep(len(audio_data) / bytes_per_second)
             
     async def stop(self):
         """Stop current speech."""
@@ -249,10 +702,15 @@ class Speaker:
         log("Speech stopped", "INFO")
         
     async def close(self):
-        """Close HTTP client."""
+        """Close HTTP client and release the media player."""
         if self._client:
             self._client.close()
             self._client = None
+            
+        if self._player is not None:
+            self._player.release()
+            self._player = None
+            self._player_listeners = ()
         
     def estimate_duration(self, text: str) -> float:
         """
@@ -264,6 +722,4 @@ class Speaker:
         Returns:
             Estimated duration in seconds
         """
-        words = len(text.split())
-        base_duration = words / 150 * 60
-        return base_duration / self.speed
+        return len(text) * self._seconds_per_char
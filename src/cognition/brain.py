@@ -4,12 +4,71 @@ Coordinates perception, cognition, and action modules.
 """
 
 import asyncio
-from typing import Any, Callable, Dict, Optional
-from datetime import datetime, timedelta
+import logging
+import random
+import re
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
-from src.utils.logger import log
+from src.utils.logger import LEVELS, log, log_exception
 from src.utils.config import Settings
 
+# Emotion keywords for spoken text, checked in one pass. When several
+# emotions match, the first one in _EMOTION_PRIORITY wins.
+_EMOTION_RE = re.compile(
+    r"(?P<happy>!|super|génial)"
+    r"|(?P<curious>\?)"
+    r"|(?P<sad>désolé|pardon)"
+    r"|(?P<angry>attention|stop)",
+    re.IGNORECASE
+)
+_EMOTION_PRIORITY = ("happy", "curious", "sad", "angry")
+
+# Startup greetings - always in FIRST person
+_GREETINGS = (
+    "Salut! Je suis prêt à discuter!",
+    "Hey! Je me suis bien réveillé!",
+    "Woof! Je suis là, qu'est-ce qu'on fait?",
+    "Me voilà! Alors, quoi de neuf?",
+)
+
+
+def _classify_emotion(text: str) -> str:
+    """Pick the eye emotion matching a sentence."""
+    found = set()
+    for match in _EMOTION_RE.finditer(text):
+        if match.lastgroup == "happy":
+            return "happy"  # Highest priority - no need to scan further
+        found.add(match.lastgroup)
+        
+    for emotion in _EMOTION_PRIORITY:
+        if emotion in found:
+            return emotion
+    return "neutral"
+
+# Shared read-only defaults, so empty paths allocate nothing
+_EMPTY_PARAMS = types.MappingProxyType({})
+_EMPTY_TUPLE: tuple = ()
+
+
+def _normalize_actions(actions: Sequence[Any]) -> List[Tuple[str, Mapping[str, Any]]]:
+    """
+    Bring LLM actions to a single (action_type, parameters) shape.
+    
+    Accepts both formats: "spin" or {"type": "spin", ...}. Anything else is
+    dropped.
+    """
+    normalized = []
+    for action in actions:
+        if isinstance(action, str):
+            normalized.append((action, _EMPTY_PARAMS))
+        elif isinstance(action, dict):
+            normalized.append((action.get("type", ""), action))
+    return normalized
+
 
 class RexBrain:
     """
@@ -21,6 +80,8 @@ class RexBrain:
     - Action (movement, speech, behaviors)
     """
     
+    SPEAK_LOCK_POLL = 0.05  # Seconds between tries while another utterance plays
+    
     def __init__(
         self,
         config: Dict[str, Any],
@@ -36,12 +97,56 @@ class RexBrain:
             log_callback: Callback for logging messages
             speech_callback: Callback when Rex speaks
             emotion_callback: Callback to change eye emotion
+            
+        speech_callback and emotion_callback are invoked from a worker
+        thread (in call order), so they must be thread-safe.
         """
         self.config = config
         self._log_callback = log_callback
         self._speech_callback = speech_callback
         self._emotion_callback = emotion_callback
         
+        # Config-derived constants (read once, used on every tick/utterance)
+        level_name = str(config.get("logging", {}).get("level", "DEBUG")).upper()
+        self._min_level = LEVELS.get(level_name, logging.DEBUG)
+        # Guard costly DEBUG f-strings with this before calling _log
+        self._debug_enabled = self._min_level <= logging.DEBUG
+        self._conv_timeout = float(
+            config.get("behavior", {}).get("conversation_timeout_seconds", 30)
+        )
+        self._robot_name_lower = config.get("robot", {}).get("name", "Néon").lower()
+        self._stop_phrase_lower = config.get("safety", {}).get("emergency_stop_phrase", "STOP").lower()
+        # Stream LLM replies so TTS can start before generation finishes
+        self._stream_llm = bool(config.get("cognition", {}).get("llm", {}).get("stream", True))
+        # Fake a 1 s duration per action while the controller is a stub
+        self._simulate_actions = bool(
+            config.get("behavior", {}).get("simulate_action_duration", False)
+        )
+        
+        # Single worker so UI callbacks stay off the event loop but in order
+        self._ui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rex-ui")
+        
+        # Action name -> handler, one dict lookup per action
+        self._action_dispatch: Dict[str, Callable[[Mapping[str, Any]], Awaitable[None]]] = {
+            "walk_to_person": self._act_walk_to_person,
+            "walk_backward": self._act_walk_backward,
+            "sit": self._act_sit,
+            "lie_down": self._act_lie_down,
+            "stand_up": self._act_stand_up,
+            "give_paw": self._act_give_paw,
+            "beg": self._act_beg,
+            "spin": self._act_spin,
+            "wave": self._act_wave,
+        }
+        
+        # Serializes _speak. A threading lock rather than an asyncio.Lock:
+        # the app speaks from more than one event loop (UI thread for the
+        # greeting, audio thread for replies)
+        self._speak_lock = threading.Lock()
+        
+        # Private RNG, independent of the shared module-level one
+        self._rng = random.Random()
+        
         # State
         self._running = False
         self._body_connected = False
@@ -50,8 +155,9 @@ class RexBrain:
         self._emergency_stop = False
         
         # Conversation state
-        self._conversation_start: Optional[datetime] = None
-        self._last_speech: Optional[datetime] = None
+        # Timestamps are time.monotonic_ns() integers (only ever subtracted)
+        self._conversation_start: Optional[int] = None
+        self._last_speech: Optional[int] = None
         self._current_speaker: Optional[str] = None
         
         # Robot state
@@ -60,9 +166,10 @@ class RexBrain:
         self._robot_mode: str = "idle"
         
         # Timers
-        self._last_scene_analysis: Optional[datetime] = None
-        self._last_idle_action: Optional[datetime] = None
-        self._last_battery_check: Optional[datetime] = None
+        self._last_scene_analysis: Optional[int] = None
+        self._last_idle_action: Optional[int] = None
+        self._last_battery_check: Optional[int] = None
+        self._timeout_handle: Optional[asyncio.TimerHandle] = None
         
         # Subsystems - initialized lazily
         self._robot_controller = None
@@ -73,17 +180,34 @@ class RexBrain:
         self._memory = None
         self._mission_manager = None
         
-        self._init_subsystems()
+        # Audio processor will be started separately
+        self._audio_initialized = False
+        
+    async def init_subsystems(self):
+        """
+        Initialize all subsystems.
         
-    def _init_subsystems(self):
-        """Initialize all subsystems."""
+        Must be awaited once after construction. The subsystem imports and
+        constructors are independent, so they run concurrently in worker
+        threads instead of one after the other.
+        """
         self._log("Initializing subsystems...", "INFO")
         
         # Rex can work without a body
         self._body_connected = False
         self._log("Note: Robot body not connected - Rex can talk but not move", "WARNING")
         
-        # Initialize LLM client
+        await asyncio.gather(
+            asyncio.to_thread(self._init_llm_client),
+            asyncio.to_thread(self._init_speaker),
+            asyncio.to_thread(self._init_mission_manager),
+        )
+        
+        self._running = True
+        self._log("Subsystems initialized", "SUCCESS")
+        
+    def _init_llm_client(self):
+        """Initialize LLM client."""
         try:
             from src.cognition.llm_client import LLMClient
             self._llm_client = LLMClient(self.config, log_callback=self._log)
@@ -91,7 +215,8 @@ class RexBrain:
         except Exception as e:
             self._log(f"LLM client failed: {e}", "ERROR")
             
-        # Initialize speaker (TTS)
+    def _init_speaker(self):
+        """Initialize speaker (TTS)."""
         try:
             from src.action.speaker import Speaker
             self._speaker = Speaker(self.config, log_callback=self._log)
@@ -99,7 +224,8 @@ class RexBrain:
         except Exception as e:
             self._log(f"Speaker failed: {e}", "ERROR")
             
-        # Initialize mission manager
+    def _init_mission_manager(self):
+        """Initialize mission manager."""
         try:
             from src.cognition.mission_manager import MissionManager
             self._mission_manager = MissionManager(log_callback=self._log)
@@ -108,12 +234,6 @@ class RexBrain:
         except Exception as e:
             self._log(f"Mission manager failed: {e}", "ERROR")
             
-        # Audio processor will be started separately
-        self._audio_initialized = False
-        
-        self._running = True
-        self._log("Subsystems initialized", "SUCCESS")
-        
     @property
     def has_body(self) -> bool:
         """Check if robot body is connected."""
@@ -128,15 +248,25 @@ class RexBrain:
             return "🧠 Brain only (no body)"
             
     def _log(self, message: str, level: str = "INFO"):
-        """Log a message."""
+        """Log a message (dropped if below the configured logging.level)."""
+        if LEVELS.get(level, logging.INFO) < self._min_level:
+            return
         log(message, level)
         if self._log_callback:
             self._log_callback(message, level)
             
+    def _post_ui(self, callback: Callable, *args):
+        """Run a UI callback on the UI worker thread without waiting for it."""
+        try:
+            self._ui_executor.submit(callback, *args)
+        except RuntimeError:
+            # Executor already shut down
+            callback(*args)
+            
     def _set_emotion(self, emotion: str):
         """Set the eye emotion."""
         if self._emotion_callback:
-            self._emotion_callback(emotion)
+            self._post_ui(self._emotion_callback, emotion)
             
     async def _speak(self, text: str):
         """Make Rex speak using TTS."""
@@ -146,46 +276,48 @@ class RexBrain:
         
         self._log(f"🗣️ _speak called with: {text}", "INFO")
         
-        # Notify UI (this will also log the speech)
-        if self._speech_callback:
-            self._speech_callback(text)
-            
-        # Set emotion based on content
-        if "!" in text or "super" in text.lower() or "génial" in text.lower():
-            self._set_emotion("happy")
-        elif "?" in text:
-            self._set_emotion("curious")
-        elif "désolé" in text.lower() or "pardon" in text.lower():
-            self._set_emotion("sad")
-        elif "attention" in text.lower() or "stop" in text.lower():
-            self._set_emotion("angry")
-        else:
-            self._set_emotion("neutral")
+        # One utterance at a time, so overlapping replies can't unmute the
+        # mic while the other one is still playing
+        while not self._speak_lock.acquire(blocking=False):
+            await asyncio.sleep(self.SPEAK_LOCK_POLL)
             
-        # Mute microphone while speaking (avoid hearing ourselves)
-        if self._audio_processor:
-            self._log("🔇 Microphone muted", "INFO")
-            self._audio_processor.mute()
-        else:
-            self._log("⚠️ No audio processor to mute", "WARNING")
+        try:
+            # Mute microphone while speaking (avoid hearing ourselves) - must
+            # happen before any audio goes out
+            if self._audio_processor:
+                self._log("🔇 Microphone muted", "INFO")
+                self._audio_processor.mute()
+            else:
+                self._log("⚠️ No audio processor to mute", "WARNING")
+                
+            # Notify UI (this will also log the speech) and set the emotion.
+            # Both are handed off, so they overlap with the TTS request
+            if self._speech_callback:
+                self._post_ui(self._speech_callback, text)
+            self._set_emotion(_classify_emotion(text))
             
-        # Actually speak using TTS
-        if self._speaker:
-            self._log("🔊 Calling speaker.speak()...", "INFO")
             try:
-                await self._speaker.speak(text)
-                self._log("🔊 speaker.speak() completed", "SUCCESS")
-            except Exception as e:
-                import traceback
-                self._log(f"🔊 TTS error: {e}", "ERROR")
-                self._log(f"🔊 Traceback: {traceback.format_exc()[:200]}", "ERROR")
-        else:
+                await self._say(text)
+            finally:
+                # Unmute microphone after speaking
+                if self._audio_processor:
+                    self._log("🔊 Microphone unmuted", "INFO")
+                    self._audio_processor.unmute()
+        finally:
+            self._speak_lock.release()
+            
+    async def _say(self, text: str):
+        """Play text through TTS, logging (not raising) failures."""
+        if not self._speaker:
             self._log("⚠️ No speaker available!", "WARNING")
-                
-        # Unmute microphone after speaking
-        if self._audio_processor:
-            self._log("🔊 Microphone unmuted", "INFO")
-            self._audio_processor.unmute()
+            return
+            
+        self._log("🔊 Calling speaker.speak()...", "INFO")
+        try:
+            await self._speaker.speak(text)
+            self._log("🔊 speaker.speak() completed", "SUCCESS")
+        except Exception as e:
+            log_exception(f"🔊 TTS error: {e}", self._log_callback)
                 
     async def start_listening(self):
         """Start the audio processor for listening."""
@@ -210,15 +342,13 @@ class RexBrain:
             self._log("Audio listening started!", "SUCCESS")
             
         except Exception as e:
-            self._log(f"Failed to start audio: {e}", "ERROR")
-            import traceback
-            self._log(f"Traceback: {traceback.format_exc()[:300]}", "ERROR")
+            log_exception(f"Failed to start audio: {e}", self._log_callback)
             
     def _on_wake_word(self):
         """Called when wake word is detected."""
         self._log("Wake word detected! 👋", "SUCCESS")
         self._in_conversation = True
-        self._conversation_start = datetime.now()
+        self._conversation_start = time.monotonic_ns()
         self._set_emotion("excited")
         
     def _on_transcription(self, result):
@@ -232,56 +362,89 @@ class RexBrain:
         if result.is_final:
             speaker = f"[Speaker {result.speaker_id}]" if result.speaker_id else ""
             self._log(f"🎤 Entendu: \"{text}\" {speaker}", "INFO")
+            # Outside a conversation only the wake word matters (the emergency
+            # stop also needs it), so skip the task for ambient chatter
+            text_lower = text.lower()
+            if not self._in_conversation and self._robot_name_lower not in text_lower:
+                if self._debug_enabled:
+                    self._log(f"💤 Ignoré (pas en conversation, wake word '{self._robot_name_lower}' absent)", "DEBUG")
+                return
             # Process in async context
-            asyncio.create_task(self.handle_speech(text, result.speaker_id))
+            asyncio.create_task(self.handle_speech(text, result.speaker_id, text_lower=text_lower))
         else:
             # Interim result - show in debug
-            self._log(f"🎤 (interim): {text}", "DEBUG")
+            if self._debug_enabled:
+                self._log(f"🎤 (interim): {text}", "DEBUG")
             
     async def tick(self):
         """
-        Main loop tick - called periodically by the Kivy app.
+        Main loop tick.
+        
+        The conversation timeout is event-driven (see
+        _arm_conversation_timeout), so there is no periodic work left here
+        and the Kivy app no longer calls it.
         """
         if not self._running or self._emergency_stop:
             return
             
+    def _arm_conversation_timeout(self):
+        """(Re)start the conversation timeout from now."""
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+        self._timeout_handle = asyncio.get_running_loop().call_later(
+            self._conv_timeout, self._on_conversation_timeout
+        )
+        
+    def _on_conversation_timeout(self):
+        """Called by the event loop when nobody spoke for the timeout."""
+        self._timeout_handle = None
+        if not self._running or not self._in_conversation:
+            return
+            
         try:
-            # Check conversation timeout
-            if self._in_conversation and self._last_speech:
-                timeout = self.config.get("behavior", {}).get("conversation_timeout_seconds", 30)
-                if (datetime.now() - self._last_speech).total_seconds() > timeout:
-                    self._log("Conversation timeout - going idle", "INFO")
-                    self._in_conversation = False
-                    self._set_emotion("neutral")
-                    if self._llm_client:
-                        self._llm_client.clear_history()
-                        
+            self._log("Conversation timeout - going idle", "INFO")
+            self._in_conversation = False
+            self._set_emotion("neutral")
+            if self._llm_client:
+                self._llm_client.clear_history()
         except Exception as e:
-            self._log(f"Tick error: {e}", "ERROR")
+            self._log(f"Timeout error: {e}", "ERROR")
             
-    async def handle_speech(self, text: str, speaker_id: Optional[int] = None):
+    async def handle_speech(
+        self,
+        text: str,
+        speaker_id: Optional[int] = None,
+        text_lower: Optional[str] = None
+    ):
         """
         Handle transcribed speech.
         
         Args:
             text: Transcribed text
             speaker_id: Optional speaker identification
+            text_lower: text.lower(), if the caller already computed it
         """
         self._log(f"Heard: {text}", "INFO")
-        self._last_speech = datetime.now()
+        self._last_speech = time.monotonic_ns()
+        self._arm_conversation_timeout()
         
-        # Check for emergency stop
-        robot_name = self.config.get("robot", {}).get("name", "Néon")
-        stop_phrase = self.config.get("safety", {}).get("emergency_stop_phrase", "STOP")
+        # Check for emergency stop (one lowercase copy for all keyword checks)
+        if text_lower is None:
+            text_lower = text.lower()
         
-        if stop_phrase.lower() in text.lower() and robot_name.lower() in text.lower():
+        # Two independent substring tests: the stop phrase may contain the
+        # name ("Rex stop"), so a single non-overlapping scan would miss it
+        has_name = self._robot_name_lower in text_lower
+        
+        if has_name and self._stop_phrase_lower in text_lower:
             await self.emergency_stop()
             return
             
         # Check if addressed to Rex (wake word or in conversation)
         if not self._in_conversation:
-            if robot_name.lower() not in text.lower():
-                self._log(f"💤 Ignoré (pas en conversation, wake word '{robot_name}' absent)", "DEBUG")
+            if not has_name:
+                if self._debug_enabled:
+                    self._log(f"💤 Ignoré (pas en conversation, wake word '{self._robot_name_lower}' absent)", "DEBUG")
                 return  # Not addressed to us
             self._on_wake_word()
             
@@ -290,7 +453,7 @@ class RexBrain:
         
         # Check for known commands → create mission
         if self._mission_manager:
-            command = self._mission_manager.detect_command(text)
+            command = self._mission_manager.detect_command(text, text_lower)
             if command:
                 self._log(f"🎯 Commande détectée: {command}", "INFO")
                 mission = self._mission_manager.create_mission_from_template(
@@ -304,7 +467,15 @@ class RexBrain:
             
         # Get response from LLM
         self._log("🤖 Calling LLM...", "INFO")
-        response = await self._get_llm_response(text, speaker_id)
+        # With streaming, speech starts as soon as its text is complete,
+        # while the rest of the reply (actions, mission) is still generated
+        speech_tasks = []
+        on_speech = None
+        if self._stream_llm:
+            def on_speech(speech: str):
+                speech_tasks.append(asyncio.ensure_future(self._speak(speech)))
+                
+        response = await self._get_llm_response(text, speaker_id, on_speech)
         self._log(f"🤖 LLM response received: {response is not None}", "INFO")
         
         if response:
@@ -318,31 +489,29 @@ class RexBrain:
                         reason=f"LLM response to: '{text}'"
                     )
                     if mission:
-                        self._mission_manager.add_mission(mission)
+                        if speech_tasks:
+                            # Already speaking (streamed): a one-step mission
+                            # can run right here without delaying speech
+                            await self._mission_manager.run_inline(mission)
+                        else:
+                            # Runs in the background, speech starts now
+                            self._mission_manager.add_mission(mission)
                 except Exception as e:
                     self._log(f"⚠️ Mission creation failed: {e}", "WARNING")
             else:
                 # Execute simple actions (backward compatibility)
-                actions = response.get("actions", [])
+                actions = response.get("actions") or _EMPTY_TUPLE
                 if actions:
                     self._log(f"🎯 Executing {len(actions)} actions: {actions}", "INFO")
-                for action in actions:
-                    try:
-                        # Handle both formats: "spin" or {"type": "spin", ...}
-                        if isinstance(action, str):
-                            action_type = action
-                            action_params = {}
-                        else:
-                            action_type = action.get("type", "")
-                            action_params = action
-                        await self._execute_action(action_type, action_params)
-                    except Exception as e:
-                        self._log(f"⚠️ Action error: {e}", "WARNING")
+                # Every action moves the body, so they cannot overlap
+                await self._execute_actions_in_order(_normalize_actions(actions))
                 
             # Speak the response
             speech_text = response.get("speech", "")
             self._log(f"🗣️ Speech to say: '{speech_text[:50] if speech_text else '(none)'}...'", "INFO")
-            if speech_text:
+            if speech_tasks:
+                await speech_tasks[0]  # Already speaking (streamed)
+            elif speech_text:
                 await self._speak(speech_text)
             else:
                 self._log("⚠️ No speech text in response", "WARNING")
@@ -355,9 +524,16 @@ class RexBrain:
                 if self._llm_client:
                     self._llm_client.clear_history()
                     
-    async def _get_llm_response(self, user_text: str, speaker_id: Optional[int] = None) -> Dict[str, Any]:
+    async def _get_llm_response(
+        self,
+        user_text: str,
+        speaker_id: Optional[int] = None,
+        on_speech: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
         """
         Get response from LLM.
+        
+        on_speech is passed to LLMClient.get_response to stream the reply.
         """
         if not self._llm_client:
             return {
@@ -368,9 +544,10 @@ class RexBrain:
             
         try:
             # Build context
-            context = {}
-            if not self._body_connected:
-                context["note"] = "Mon corps de robot n'est pas connecté, je ne peux pas bouger"
+            if self._body_connected:
+                context = _EMPTY_PARAMS
+            else:
+                context = {"note": "Mon corps de robot n'est pas connecté, je ne peux pas bouger"}
                 
             # Get speaker name if known
             speaker_name = None
@@ -380,7 +557,8 @@ class RexBrain:
             response = await self._llm_client.get_response(
                 user_text,
                 speaker_name=speaker_name,
-                additional_context=context
+                additional_context=context,
+                on_speech=on_speech
             )
             
             return response
@@ -393,39 +571,87 @@ class RexBrain:
                 "end_conversation": False
             }
             
-    async def _execute_action(self, action_type: str, parameters: Dict[str, Any] = None) -> bool:
+    async def _execute_actions_in_order(self, actions):
+        """Execute (action_type, parameters) pairs one after the other."""
+        for action_type, action_params in actions:
+            try:
+                await self._execute_action(action_type, action_params)
+            except Exception as e:
+                self._log(f"⚠️ Action error: {e}", "WARNING")
+                
+    async def _execute_action(self, action_type: str, parameters: Optional[Mapping[str, Any]] = None) -> bool:
         """
         Execute a movement or behavior action.
         
         Args:
             action_type: Type of action (e.g., "walk_to_person", "sit")
-            parameters: Action parameters
+            parameters: Action parameters (read-only - copy before changing)
             
         Returns:
             True if action succeeded, False otherwise
         """
         if parameters is None:
-            parameters = {}
+            parameters = _EMPTY_PARAMS
             
         if not self._body_connected:
             self._log(f"🤖 Action '{action_type}' - corps non connecté (ignoré)", "DEBUG")
             # No delay - just skip the action
             return True
             
+        handler = self._action_dispatch.get(action_type)
+        if handler is None:
+            # Not fatal: an LLM mission step may name an action we lack
+            self._log(f"⚠️ Unknown action ignored: {action_type}", "WARNING")
+            return True
+            
         self._log(f"🤖 Executing: {action_type} {parameters}", "ROBOT")
         
-        # TODO: Send to robot controller when connected
-        # For now, simulate execution
         try:
             if self._robot_controller:
-                # await self._robot_controller.execute(action_type, parameters)
-                pass
-            await asyncio.sleep(1.0)  # Simulate action duration
+                await handler(parameters)
+            if self._simulate_actions:
+                await asyncio.sleep(1.0)  # Simulate action duration
             return True
         except Exception as e:
             self._log(f"Action failed: {e}", "ERROR")
             return False
         
+    # ============ ACTION HANDLERS ============
+    # Thin wrappers around the robot controller, looked up by name in
+    # _action_dispatch. Only called while a controller exists.
+    
+    async def _act_walk_to_person(self, parameters: Mapping[str, Any]):
+        # Simulated: without person tracking there is no way to steer
+        # towards the target, and walking blind is not safe
+        self._log(f"🤖 walk_to_person {parameters.get('target', '?')} simulé (pas de suivi de personne)", "INFO")
+        
+    async def _act_walk_backward(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.walk(-float(parameters.get("distance", 1.0)))
+        
+    async def _act_sit(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.sit()
+        
+    async def _act_lie_down(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.lie_down()
+        
+    async def _act_stand_up(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.stand()
+        
+    async def _act_give_paw(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.shake_paw()
+        
+    async def _act_beg(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.heart()
+        
+    async def _act_spin(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.turn(
+            parameters.get("direction", "left"),
+            float(parameters.get("degrees", 360))
+        )
+        
+    async def _act_wave(self, parameters: Mapping[str, Any]):
+        await self._robot_controller.wave()
+        
     async def emergency_stop(self):
         """Emergency stop - lie down and stop all movement."""
         self._log("🚨 EMERGENCY STOP!", "WARNING")
@@ -440,18 +666,7 @@ class RexBrain:
         
     async def say_hello(self):
         """Make Rex say hello on startup."""
-        robot_name = self.config.get("robot", {}).get("name", "Néo")
-        
-        # Always speak in FIRST person
-        greetings = [
-            "Salut! Je suis prêt à discuter!",
-            "Hey! Je me suis bien réveillé!",
-            "Woof! Je suis là, qu'est-ce qu'on fait?",
-            "Me voilà! Alors, quoi de neuf?",
-        ]
-        
-        import random
-        greeting = random.choice(greetings)
+        greeting = self._rng.choice(_GREETINGS)
         
         self._set_emotion("happy")
         await self._speak(greeting)
@@ -480,6 +695,9 @@ class RexBrain:
         """Graceful shutdown."""
         self._log("Shutting down...", "WARNING")
         self._running = False
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
         self._set_emotion("sleeping")
         
         await self._speak("Bonne nuit!")
@@ -492,4 +710,9 @@ class RexBrain:
         if self._robot_controller and self._body_connected:
             await self._robot_controller.disconnect()
             
+        # Close the HTTP pool shared by LLM clients
+        if self._llm_client:
+            await self._llm_client.shutdown_shared()
+            
+        self._ui_executor.shutdown(wait=False)
         self._log("Shutdown complete", "INFO")
@@ -4,13 +4,126 @@ Uses direct HTTP calls to Claude API (no SDK needed for Android compatibility).
 """
 
 import asyncio
-import json
-from typing import Any, Dict, List, Optional
+import random
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
 
 import httpx
 
+from src.utils.compat import HTTP2_AVAILABLE, JSONDecodeError, dumps_bytes, loads
 from src.utils.config import get_api_key, load_personality
-from src.utils.logger import log
+from src.utils.logger import log, log_exception
+
+
+# Resolve the CA bundle once - fallback to unverified for Android
+try:
+    import certifi
+    _VERIFY = certifi.where()
+except Exception:
+    _VERIFY = False
+
+# Keep the TLS connection to Anthropic warm for the whole robot session
+_CLIENT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120.0)
+_CLIENT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+
+# Fixed end of the system prompt ({name} is the robot's name)
+_PROMPT_CAPABILITIES = """# Capacités physiques
+Tu es un chien robot Unitree Go2. Tu peux:
+- Marcher, courir, reculer
+- T'asseoir, te coucher, te lever
+- Donner la patte, faire le beau
+- Tourner sur toi-même
+- Suivre quelqu'un, aller vers quelqu'un
+
+Les commandes de mouvement courantes (assis, couché, viens, au pied, etc.) sont gérées automatiquement.
+Pour des actions personnalisées, tu peux créer une "mission" avec plusieurs étapes.
+
+# Format de réponse
+Tu dois TOUJOURS répondre en JSON avec ce format exact:
+{
+    "speech": "Ce que tu veux dire à voix haute",
+    "actions": [],
+    "mission": null,
+    "internal_thought": "Réflexion interne optionnelle",
+    "end_conversation": false
+}
+
+Pour une mission complexe (optionnel):
+{
+    "speech": "J'arrive!",
+    "mission": {
+        "goal": "Description du but",
+        "steps": [
+            {"action": "walk_to_person", "parameters": {"target": "speaker"}},
+            {"action": "sit"},
+            {"action": "give_paw"}
+        ]
+    },
+    "end_conversation": false
+}
+
+Actions disponibles: walk_to_person, walk_backward, sit, lie_down, stand_up, give_paw, beg, spin, wave
+
+Règles IMPORTANTES:
+- Tu parles TOUJOURS à la PREMIÈRE PERSONNE ("je", "moi", "mon")
+- JAMAIS à la 3ème personne (ne dis JAMAIS "{name} pense que..." ou "Il/Elle...")
+- Réponds TOUJOURS en JSON valide
+- "speech" peut être vide si tu ne veux rien dire
+- "actions" et "mission" peuvent être vides/null
+- Sois CONCIS - pas de longs discours, 1-2 phrases max
+- "end_conversation" = true si la conversation semble terminée
+"""
+
+
+_JSON_WS = " \t\r\n"
+
+
+def _find_speech(text: str) -> Optional[str]:
+    """
+    Raw (still escaped) value of the first complete "speech" string in text.
+    
+    A linear scan - no regex backtracking on long or malformed replies.
+    Returns None if there is no "speech" field or its closing quote is
+    missing.
+    """
+    n = len(text)
+    key = text.find('"speech"')
+    while key != -1:
+        i = key + 8
+        while i < n and text[i] in _JSON_WS:
+            i += 1
+        if i < n and text[i] == ":":
+            i += 1
+            while i < n and text[i] in _JSON_WS:
+                i += 1
+            if i < n and text[i] == '"':
+                start = i + 1
+                end = text.find('"', start)
+                while end != -1:
+                    # A quote preceded by an odd number of backslashes is escaped
+                    backslashes = 0
+                    while text[end - 1 - backslashes] == "\\":
+                        backslashes += 1
+                    if backslashes % 2 == 0:
+                        return text[start:end]
+                    end = text.find('"', end + 1)
+                return None
+        key = text.find('"speech"', key + 1)
+    return None
+
+
+def _unescape_speech(raw: str) -> str:
+    """
+    Decode a raw speech value from _find_speech().
+    
+    Decoded as a JSON string, so TTS says exactly what the parsed reply
+    holds; invalid escapes (broken reply) fall back to the common ones.
+    """
+    try:
+        return loads('"' + raw + '"')
+    except JSONDecodeError:
+        return raw.replace('\\"', '"').replace('\\n', ' ')
 
 
 class LLMClient:
@@ -21,6 +134,15 @@ class LLMClient:
     
     API_URL = "https://api.anthropic.com/v1/messages"
     
+    # One connection pool shared by all instances. httpx clients are bound
+    # to the event loop they were first used on, so it's remade per loop.
+    _shared_client: Optional[httpx.AsyncClient] = None
+    _shared_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    RETRY_STATUSES = (429, 529)  # Rate limited / overloaded
+    MAX_RETRY_DELAY = 30.0  # Seconds
+    RETRY_JITTER = 0.5  # Backoff delays are stretched by up to 50%
+    
     def __init__(self, config: Dict[str, Any], log_callback=None):
         """
         Initialize LLM client.
@@ -41,15 +163,33 @@ class LLMClient:
         # Load personality
         self.personality = load_personality()
         
-        # Conversation history (short-term memory)
-        self.conversation_history: List[Dict[str, str]] = []
-        self.max_history = config.get("cognition", {}).get("memory", {}).get("short_term_messages", 20)
+        # Conversation history (short-term memory), bounded both in messages
+        # and in approximate tokens - see _append_history
+        memory_config = config.get("cognition", {}).get("memory", {})
+        self.max_history = memory_config.get("short_term_messages", 20)
+        self.max_history_tokens = memory_config.get("short_term_tokens", 4000)
+        self.conversation_history: Deque[Dict[str, str]] = deque()
+        self._history_tokens: Deque[int] = deque()  # Estimate per message
+        self._token_sum = 0
         
         # Build system prompt
         self.system_prompt = self._build_system_prompt()
         
-        # HTTP client
-        self._client: Optional[httpx.AsyncClient] = None
+        # Static parts of every request, serialized once: only the messages
+        # change between calls
+        self._headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        }
+        static_body = {
+            "model": self.llm_config.get("model", "claude-3-5-haiku-20241022"),
+            "max_tokens": self.llm_config.get("max_tokens", 500),
+            "system": self.system_prompt
+        }
+        self._static_body_prefix = dumps_bytes(static_body)[:-1] + b',"messages":'
+        static_body["stream"] = True
+        self._stream_body_prefix = dumps_bytes(static_body)[:-1] + b',"messages":'
         
     def _log(self, message: str, level: str = "INFO"):
         """Log a message."""
@@ -58,19 +198,38 @@ class LLMClient:
             self._log_callback(message, level)
         
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            # Try with certifi, fallback to unverified for Android
-            try:
-                import certifi
-                import ssl
-                ssl_context = ssl.create_default_context()
-                ssl_context.load_verify_locations(certifi.where())
-                self._client = httpx.AsyncClient(timeout=30.0, verify=certifi.where())
-            except Exception:
-                # Fallback for Android
-                self._client = httpx.AsyncClient(timeout=30.0, verify=False)
-        return self._client
+        """Get or create the shared HTTP client."""
+        # No await between check and assignment, so no lock is needed
+        cls = LLMClient
+        loop = asyncio.get_running_loop()
+        client = cls._shared_client
+        old_loop = cls._shared_loop
+        if client is None or client.is_closed or old_loop is not loop:
+            cls._shared_client = httpx.AsyncClient(
+                timeout=_CLIENT_TIMEOUT,
+                verify=_VERIFY,
+                http2=HTTP2_AVAILABLE,
+                limits=_CLIENT_LIMITS
+            )
+            cls._shared_loop = loop
+            # A client left behind by another loop still holds its pool
+            if client is not None and not client.is_closed:
+                await cls._close_client(client, old_loop)
+        return cls._shared_client
+        
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a client on the loop that owns its connections."""
+        try:
+            if loop is None or loop is asyncio.get_running_loop():
+                await client.aclose()
+            elif not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                # Its loop is gone: close the sockets from here, best effort
+                await client.aclose()
+        except Exception:
+            pass
         
     def _build_system_prompt(self) -> str:
         """Build the system prompt from personality config."""
@@ -92,74 +251,56 @@ class LLMClient:
             for ex in examples[:5]
         ])
         
-        system_prompt = f"""# Identité
-{identity}
-
-Ton nom est {robot_name}. Tes maîtres sont: {', '.join(masters)}.
-
-# Style de communication
-{speaking_style}
-
-# Relation avec tes maîtres
-{masters_rel}
-
-# Relation avec les inconnus
-{strangers_rel}
-
-# Obéissance
-{obedience}
-
-# Exemples de réponses
-{examples_text}
-
-# Capacités physiques
-Tu es un chien robot Unitree Go2. Tu peux:
-- Marcher, courir, reculer
-- T'asseoir, te coucher, te lever
-- Donner la patte, faire le beau
-- Tourner sur toi-même
-- Suivre quelqu'un, aller vers quelqu'un
-
-Les commandes de mouvement courantes (assis, couché, viens, au pied, etc.) sont gérées automatiquement.
-Pour des actions personnalisées, tu peux créer une "mission" avec plusieurs étapes.
-
-# Format de réponse
-Tu dois TOUJOURS répondre en JSON avec ce format exact:
-{{
-    "speech": "Ce que tu veux dire à voix haute",
-    "actions": [],
-    "mission": null,
-    "internal_thought": "Réflexion interne optionnelle",
-    "end_conversation": false
-}}
-
-Pour une mission complexe (optionnel):
-{{
-    "speech": "J'arrive!",
-    "mission": {{
-        "goal": "Description du but",
-        "steps": [
-            {{"action": "walk_to_person", "parameters": {{"target": "speaker"}}}},
-            {{"action": "sit"}},
-            {{"action": "give_paw"}}
+        parts = [
+            "# Identité",
+            identity,
+            "",
+            f"Ton nom est {robot_name}. Tes maîtres sont: {', '.join(masters)}.",
+            "",
+            "# Style de communication",
+            speaking_style,
+            "",
+            "# Relation avec tes maîtres",
+            masters_rel,
+            "",
+            "# Relation avec les inconnus",
+            strangers_rel,
+            "",
+            "# Obéissance",
+            obedience,
+            "",
+            "# Exemples de réponses",
+            examples_text,
+            "",
+            _PROMPT_CAPABILITIES.replace("{name}", robot_name)
         ]
-    }},
-    "end_conversation": false
-}}
-
-Actions disponibles: walk_to_person, walk_backward, sit, lie_down, stand_up, give_paw, beg, spin, wave
-
-Règles IMPORTANTES:
-- Tu parles TOUJOURS à la PREMIÈRE PERSONNE ("je", "moi", "mon")
-- JAMAIS à la 3ème personne (ne dis JAMAIS "{robot_name} pense que..." ou "Il/Elle...")
-- Réponds TOUJOURS en JSON valide
-- "speech" peut être vide si tu ne veux rien dire
-- "actions" et "mission" peuvent être vides/null
-- Sois CONCIS - pas de longs discours, 1-2 phrases max
-- "end_conversation" = true si la conversation semble terminée
-"""
-        return system_prompt
+        return "\n".join(parts)
         
+    def _append_history(self, role: str, content: str):
+        """
+        Add a message to the history, evicting the oldest ones as needed.
+        
+        Keeps at most max_history messages and roughly max_history_tokens
+        tokens (~4 characters per token), so one long paragraph can't blow
+        up the request. The newest message is always kept, and the history
+        never starts with an assistant turn (the API rejects that).
+        """
+        history = self.conversation_history
+        tokens = self._history_tokens
+        
+        history.append({"role": role, "content": content})
+        count = len(content) // 4 + 8
+        tokens.append(count)
+        self._token_sum += count
+        
+        while len(history) > 1 and (
+            len(history) > self.max_history
+            or self._token_sum > self.max_history_tokens
+            or history[0]["role"] == "assistant"
+        ):
+            history.popleft()
+            self._token_sum -= tokens.popleft()
+            
     def add_context(self, context: Dict[str, Any]):
         """Add contextual information to the next request."""
         self._current_context = context
@@ -168,7 +309,8 @@ Règles IMPORTANTES:
         self,
         user_message: str,
         speaker_name: Optional[str] = None,
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Dict[str, Any]] = None,
+        on_speech: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Get a response from Claude via direct HTTP call.
@@ -177,6 +319,9 @@ Règles IMPORTANTES:
             user_message: The user's message
             speaker_name: Name of the speaker if known
             additional_context: Additional context
+            on_speech: If given, the reply is streamed and this is called
+                with the "speech" text as soon as it is complete, before the
+                rest of the reply (actions, mission...) has been generated
             
         Returns:
             Dict with 'speech', 'actions', 'internal_thought', 'end_conversation'
@@ -193,18 +338,14 @@ Règles IMPORTANTES:
         full_message = f"{context_text}\n{speaker_prefix}{user_message}" if context_text else f"{speaker_prefix}{user_message}"
         
         # Add to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": full_message
-        })
+        self._append_history("user", full_message)
         
-        # Trim history if too long
-        while len(self.conversation_history) > self.max_history:
-            self.conversation_history.pop(0)
-            
         try:
             self._log(f"🤖 LLM: Getting response for '{user_message[:50]}...'", "INFO")
             client = await self._get_client()
+            stream = on_speech is not None
+            prefix = self._stream_body_prefix if stream else self._static_body_prefix
+            content = prefix + dumps_bytes(list(self.conversation_history)) + b"}"
             
             # Retry with exponential backoff for overloaded errors
             max_retries = 3
@@ -213,29 +354,24 @@ Règles IMPORTANTES:
             for attempt in range(max_retries):
                 self._log(f"🤖 LLM: Calling Claude API (attempt {attempt + 1}/{max_retries})...", "INFO")
                 
-                # Make direct API call
-                response = await client.post(
-                    self.API_URL,
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json"
-                    },
-                    json={
-                        "model": self.llm_config.get("model", "claude-3-5-haiku-20241022"),
-                        "max_tokens": self.llm_config.get("max_tokens", 500),
-                        "system": self.system_prompt,
-                        "messages": self.conversation_history
-                    }
-                )
+                # Make direct API call (body left unread when streaming)
+                request = client.build_request("POST", self.API_URL, headers=self._headers, content=content)
+                response = await client.send(request, stream=stream)
                 
                 self._log(f"🤖 LLM: Got response status={response.status_code}", "INFO")
                 
-                # Handle overloaded error (529) with retry
-                if response.status_code == 529:
+                if response.status_code == 200:
+                    # Success - break out of retry loop
+                    break
+                    
+                await response.aread()
+                await response.aclose()
+                
+                # Handle rate limit (429) / overloaded (529) errors with retry
+                if response.status_code in self.RETRY_STATUSES:
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
-                        self._log(f"⚠️ Claude overloaded, retrying in {delay}s...", "WARNING")
+                        delay = self._retry_delay(response, attempt, base_delay)
+                        self._log(f"⚠️ Claude overloaded, retrying in {delay:.1f}s...", "WARNING")
                         await asyncio.sleep(delay)
                         continue
                     else:
@@ -243,25 +379,27 @@ Règles IMPORTANTES:
                         return self._error_response()
                 
                 # Handle other errors
-                if response.status_code != 200:
-                    self._log(f"❌ Claude API error: {response.status_code}", "ERROR")
-                    self._log(f"❌ Response: {response.text[:200]}", "ERROR")
-                    return self._error_response()
-                
-                # Success - break out of retry loop
-                break
+                self._log(f"❌ Claude API error: {response.status_code}", "ERROR")
+                self._log(f"❌ Response: {response.text[:200]}", "ERROR")
+                return self._error_response()
             
             # Parse response
-            data = response.json()
-            response_text = data["content"][0]["text"]
+            if stream:
+                try:
+                    response_text = await self._read_stream(response, on_speech)
+                finally:
+                    await response.aclose()
+            else:
+                data = loads(response.content)
+                response_text = data["content"][0]["text"]
             self._log(f"🤖 LLM raw: {response_text[:150]}...", "DEBUG")
             
             # Try to parse as JSON
             try:
-                result = json.loads(response_text)
+                result = loads(response_text)
                 speech = result.get('speech', '(none)')
                 self._log(f"🤖 LLM speech: {speech}", "INFO")  # Full speech, no truncation
-            except json.JSONDecodeError as e:
+            except JSONDecodeError as e:
                 self._log(f"⚠️ JSON parse error: {e}", "WARNING")
                 # Try to extract speech from truncated JSON
                 speech = self._extract_speech_from_broken_json(response_text)
@@ -273,29 +411,68 @@ Règles IMPORTANTES:
                 self._log(f"🤖 Extracted speech: {speech}", "INFO")
                 
             # Add assistant response to history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response_text
-            })
+            self._append_history("assistant", response_text)
             
             return result
             
         except Exception as e:
-            import traceback
-            self._log(f"❌ LLM exception: {e}", "ERROR")
-            self._log(f"❌ Traceback: {traceback.format_exc()[:300]}", "ERROR")
+            log_exception(f"❌ LLM exception: {e}", self._log_callback)
             return self._error_response()
             
+    def _retry_delay(self, response: httpx.Response, attempt: int, base_delay: float) -> float:
+        """
+        Seconds to wait before retrying a rate-limited/overloaded request.
+        
+        Honors the server's Retry-After header when it gives a number of
+        seconds, otherwise uses exponential backoff (1s, 2s, 4s...). Both get
+        random jitter so clients that failed together don't retry together.
+        """
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(self.MAX_RETRY_DELAY, float(retry_after)) + random.random() * self.RETRY_JITTER
+            except ValueError:
+                pass  # HTTP-date form - fall back to backoff
+                
+        delay = base_delay * (2 ** attempt) * (1 + random.random() * self.RETRY_JITTER)
+        return min(self.MAX_RETRY_DELAY, delay)
+        
+    async def _read_stream(self, response: httpx.Response, on_speech: Callable[[str], None]) -> str:
+        """
+        Collect the text of a streamed (server-sent events) reply.
+        
+        Calls on_speech once, as soon as the "speech" field is complete.
+        
+        Returns:
+            The full reply text, as in a non-streamed response
+        """
+        text = ""
+        speech_sent = False
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            event = loads(line[5:])
+            kind = event.get("type")
+            if kind == "content_block_delta":
+                delta = event.get("delta", {})
+                if delta.get("type") == "text_delta":
+                    text += delta.get("text", "")
+                    if not speech_sent:
+                        speech = _find_speech(text)
+                        if speech is not None:
+                            speech_sent = True
+                            if speech:
+                                on_speech(_unescape_speech(speech))
+            elif kind == "error":
+                raise RuntimeError(f"Claude stream error: {event.get('error')}")
+        return text
+        
     def _extract_speech_from_broken_json(self, text: str) -> str:
         """Extract speech field from truncated/broken JSON."""
-        import re
         # Try to find "speech": "..." pattern
-        match = re.search(r'"speech"\s*:\s*"([^"]*(?:\\.[^"]*)*)"', text)
-        if match:
-            speech = match.group(1)
-            # Unescape common escapes
-            speech = speech.replace('\\"', '"').replace('\\n', ' ')
-            return speech
+        speech = _find_speech(text)
+        if speech is not None:
+            return _unescape_speech(speech)
         return "Désolé, j'ai eu un problème. Tu peux répéter ?"
     
     def _error_response(self) -> Dict[str, Any]:
@@ -308,10 +485,20 @@ Règles IMPORTANTES:
             
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._history_tokens.clear()
+        self._token_sum = 0
         
     async def close(self):
-        """Close HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Close the HTTP connection pool (shared: the next request reopens it)."""
+        await self.shutdown_shared()
+        
+    @classmethod
+    async def shutdown_shared(cls):
+        """Close the connection pool shared by all clients (app teardown)."""
+        client = cls._shared_client
+        loop = cls._shared_loop
+        cls._shared_client = None
+        cls._shared_loop = None
+        if client is not None and not client.is_closed:
+            await cls._close_client(client, loop)
@@ -3,16 +3,125 @@ Long-term memory for Rex-Brain.
 Persistent storage for people, conversations, and events.
 """
 
+import atexit
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import sqlite3
 import asyncio
+import queue
+import threading
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
+import numpy as np
 
 from src.utils.logger import log
 
+# Statements are module constants so every call passes the very same SQL
+# text and hits the connection's prepared-statement cache
+_SQL_ADD_PERSON = (
+    "INSERT OR REPLACE INTO people (id, name, is_master, notes, last_seen) "
+    "VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)"
+)
+_SQL_GET_PERSON = "SELECT * FROM people WHERE id = ?"
+_SQL_GET_PERSON_BY_NAME = "SELECT * FROM people WHERE LOWER(name) = LOWER(?)"
+_SQL_UPDATE_PERSON_SEEN = "UPDATE people SET last_seen = CURRENT_TIMESTAMP WHERE id = ?"
+_SQL_ALL_PEOPLE = "SELECT * FROM people ORDER BY last_seen DESC"
+_SQL_ADD_CONVERSATION = (
+    "INSERT INTO conversations (person_id, summary, full_transcript, embedding) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SQL_CONVERSATIONS_WITH = (
+    "SELECT id, person_id, summary, timestamp, full_transcript FROM conversations "
+    "WHERE person_id = ? ORDER BY timestamp DESC LIMIT ?"
+)
+_FACT_COLUMNS = "id, subject, predicate, object, source, confidence, timestamp"
+_SQL_ADD_FACT = (
+    "INSERT INTO facts (subject, predicate, object, source, confidence, embedding) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_FACTS_ABOUT = (
+    f"SELECT {_FACT_COLUMNS} FROM facts WHERE LOWER(subject) = LOWER(?) "
+    "ORDER BY confidence DESC, timestamp DESC"
+)
+_SQL_SEARCH_FACTS = (
+    f"SELECT {_FACT_COLUMNS} FROM facts "
+    "WHERE subject LIKE ? OR predicate LIKE ? OR object LIKE ? "
+    "ORDER BY confidence DESC, timestamp DESC LIMIT 20"
+)
+_SQL_SEARCH_FACTS_FTS = (
+    "SELECT facts.id, facts.subject, facts.predicate, facts.object, "
+    "facts.source, facts.confidence, facts.timestamp FROM facts_fts JOIN facts ON facts.id = facts_fts.rowid "
+    "WHERE facts_fts MATCH ? ORDER BY rank LIMIT 20"
+)
+_SQL_ADD_EVENT = (
+    "INSERT INTO events (event_type, description, participants, importance) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SQL_RECENT_EVENTS = (
+    "SELECT * FROM events WHERE importance >= ? ORDER BY timestamp DESC LIMIT ?"
+)
+_SQL_FACT_EMBEDDINGS = (
+    "SELECT predicate, object, embedding FROM facts "
+    "WHERE LOWER(subject) = LOWER(?) AND embedding IS NOT NULL"
+)
+_SQL_CONVERSATION_EMBEDDINGS = (
+    "SELECT summary, embedding FROM conversations "
+    "WHERE person_id = ? AND embedding IS NOT NULL"
+)
+
+# Insert statement per write-behind queue item kind
+_SQL_WRITES = {
+    "conversation": _SQL_ADD_CONVERSATION,
+    "fact": _SQL_ADD_FACT,
+    "event": _SQL_ADD_EVENT,
+}
+
+_SQL_PERSON_CONTEXT = """
+    SELECT p.name, p.is_master, p.notes,
+        (SELECT json_group_array(json_object('predicate', predicate, 'object', object))
+         FROM (SELECT predicate, object FROM facts
+               WHERE LOWER(subject) = LOWER(p.name)
+               ORDER BY confidence DESC, timestamp DESC
+               LIMIT 5)) AS facts_json,
+        (SELECT json_group_array(summary)
+         FROM (SELECT summary FROM conversations
+               WHERE person_id = p.id
+               ORDER BY timestamp DESC
+               LIMIT 3)) AS convos_json
+    FROM people p
+    WHERE p.id = ?
+"""
+
+
+def _embedding_blob(embedding: Optional[np.ndarray]) -> Optional[bytes]:
+    """Store an embedding as unit-length float16 bytes (dot = cosine)."""
+    if embedding is None:
+        return None
+    vec = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = vec / norm
+    return vec.astype(np.float16).tobytes()
+
+
+def _most_similar(rows: List[sqlite3.Row], query: np.ndarray, k: int) -> List[sqlite3.Row]:
+    """The k rows whose embedding is closest to query, best first."""
+    if not rows:
+        return []
+    query = np.asarray(query, dtype=np.float32).ravel()
+    dim = query.shape[0]
+    # Skip rows embedded with another model (different dimension)
+    rows = [row for row in rows if len(row['embedding']) == dim * 2]
+    if not rows:
+        return []
+    matrix = np.frombuffer(b"".join(row['embedding'] for row in rows), dtype=np.float16)
+    scores = matrix.reshape(len(rows), dim).astype(np.float32) @ query
+    best = np.argsort(-scores)[:k]
+    return [rows[i] for i in best]
+
 
 class LongTermMemory:
     """
@@ -22,8 +131,19 @@ class LongTermMemory:
     - People profiles (linked to face embeddings)
     - Important conversation summaries
     - Key events and facts
+    
+    Facts, events and conversation summaries are written behind: the
+    methods queue the row and return, and a writer thread commits queued
+    rows in batches. Reads of those tables flush() first, so they see every
+    earlier write; pending rows are also flushed at exit.
     """
     
+    WRITE_BATCH_WINDOW = 0.05  # Seconds to gather more writes into a batch
+    WRITE_BATCH_MAX = 100  # Rows per transaction at most
+    WRITE_RETRIES = 3  # Attempts for a failing batch before going row by row
+    WRITE_RETRY_DELAY = 0.1  # Seconds, multiplied by the attempt number
+    CONTEXT_CACHE_SIZE = 32  # People whose LLM context is kept
+    
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize long-term memory.
@@ -38,8 +158,35 @@ class LongTermMemory:
             db_path = str(data_dir / "memory.db")
             
         self.db_path = db_path
+        
+        # One long-lived connection shared by all calls (autocommit mode),
+        # serialized with a lock since callers may be on different threads
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-8192")  # 8 MB
+        self._lock = threading.RLock()
+        
+        # get_context_for_person() results as person_id -> (version, text);
+        # _version is bumped on every write, which invalidates them all
+        self._version = 0
+        self._ctx_cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        
         self._init_database()
         
+        # Write-behind queue of (kind, row) items, see _writer_loop
+        self._write_q: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="memory-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+        
     def _init_database(self):
         """Initialize database tables."""
         with self._get_connection() as conn:
@@ -95,17 +242,163 @@ class LongTermMemory:
                 )
             """)
             
-            conn.commit()
+            # Indexes for the lookups below (the LOWER() ones match the
+            # case-insensitive WHERE clauses exactly, so SQLite can use them)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_people_name_lower ON people(LOWER(name))")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_facts_subject_lower "
+                "ON facts(LOWER(subject), confidence DESC, timestamp DESC)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_convos_person_ts "
+                "ON conversations(person_id, timestamp DESC)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_importance_ts "
+                "ON events(importance, timestamp DESC)"
+            )
             
+            # Embedding columns (added to databases created without them)
+            for table in ("conversations", "facts"):
+                cursor.execute(f"PRAGMA table_info({table})")
+                if "embedding" not in {row["name"] for row in cursor.fetchall()}:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN embedding BLOB")
+                    
+            self._fts = self._init_facts_fts(cursor)
+            
+    def _init_facts_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Create the full-text index over facts, kept in sync by triggers.
+        
+        Returns:
+            False if this SQLite build has no FTS5 (search falls back to LIKE)
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'facts_fts'")
+        existed = cursor.fetchone() is not None
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts
+                USING fts5(subject, predicate, object, content='facts', content_rowid='id')
+            """)
+        except sqlite3.OperationalError as e:
+            log(f"FTS5 unavailable, fact search uses LIKE: {e}", "WARNING")
+            return False
+            
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS facts_fts_insert AFTER INSERT ON facts BEGIN
+                INSERT INTO facts_fts(rowid, subject, predicate, object)
+                VALUES (new.id, new.subject, new.predicate, new.object);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS facts_fts_delete AFTER DELETE ON facts BEGIN
+                INSERT INTO facts_fts(facts_fts, rowid, subject, predicate, object)
+                VALUES ('delete', old.id, old.subject, old.predicate, old.object);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS facts_fts_update AFTER UPDATE ON facts BEGIN
+                INSERT INTO facts_fts(facts_fts, rowid, subject, predicate, object)
+                VALUES ('delete', old.id, old.subject, old.predicate, old.object);
+                INSERT INTO facts_fts(rowid, subject, predicate, object)
+                VALUES (new.id, new.subject, new.predicate, new.object);
+            END
+        """)
+        
+        if not existed:
+            # Index the facts stored before FTS was added
+            cursor.execute("INSERT INTO facts_fts(facts_fts) VALUES ('rebuild')")
+        return True
+        
     @contextmanager
     def _get_connection(self):
-        """Get database connection context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Get exclusive use of the shared database connection."""
+        with self._lock:
+            yield self._conn
+            
+    @contextmanager
+    def _transaction(self):
+        """Shared connection inside one explicit transaction (one commit)."""
+        with self._get_connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            
+    def _writer_loop(self):
+        """Commit queued writes, one transaction per batch."""
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                self._write_q.task_done()
+                return
+                
+            # Gather whatever else arrives within the batch window
+            batch = [item]
+            deadline = time.monotonic() + self.WRITE_BATCH_WINDOW
+            while len(batch) < self.WRITE_BATCH_MAX:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._write_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Stop after this batch
+                    self._write_q.task_done()
+                    self._write_q.put(None)
+                    break
+                batch.append(item)
+                
+            self._write_batch(batch)
+            for _ in batch:
+                self._write_q.task_done()
+                
+    def _write_batch(self, batch: List[Tuple[str, tuple]]):
+        """Insert a batch of queued rows in one transaction."""
+        rows_by_kind: Dict[str, List[tuple]] = {}
+        for kind, row in batch:
+            rows_by_kind.setdefault(kind, []).append(row)
+            
+        # Transient errors (e.g. a locked database) get retried
+        for attempt in range(1, self.WRITE_RETRIES + 1):
+            try:
+                with self._transaction() as conn:
+                    for kind, rows in rows_by_kind.items():
+                        conn.executemany(_SQL_WRITES[kind], rows)
+                    self._version += 1
+                return
+            except Exception as e:
+                log(f"Memory write failed (attempt {attempt}/{self.WRITE_RETRIES}): {e}", "WARNING")
+                if attempt < self.WRITE_RETRIES:
+                    time.sleep(self.WRITE_RETRY_DELAY * attempt)
+                
+        # Still failing: commit row by row so only the bad rows are lost
+        for kind, row in batch:
+            try:
+                with self._transaction() as conn:
+                    conn.execute(_SQL_WRITES[kind], row)
+                    self._version += 1
+            except Exception as e:
+                log(f"Memory write failed ({kind} row lost): {e}", "ERROR")
+                
+    def flush(self):
+        """Wait until every queued write is committed."""
+        if self._writer.is_alive():
+            self._write_q.join()
+        
+    def close(self):
+        """Flush pending writes and close the database connection."""
+        if self._writer.is_alive():
+            self._write_q.put(None)
+            self._writer.join()
+        with self._lock:
+            self._conn.close()
+        atexit.unregister(self.close)
             
     # ============ PEOPLE ============
     
@@ -119,11 +412,8 @@ class LongTermMemory:
         """Add a new person to memory."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO people (id, name, is_master, notes, last_seen)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """, (person_id, name, is_master, notes))
-            conn.commit()
+            cursor.execute(_SQL_ADD_PERSON, (person_id, name, is_master, notes))
+            self._version += 1
             
         log(f"Added person to memory: {name}", "INFO")
         
@@ -131,7 +421,7 @@ class LongTermMemory:
         """Get a person by ID."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM people WHERE id = ?", (person_id,))
+            cursor.execute(_SQL_GET_PERSON, (person_id,))
             row = cursor.fetchone()
             
             if row:
@@ -142,27 +432,20 @@ class LongTermMemory:
         """Get people by name (may return multiple)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM people WHERE LOWER(name) = LOWER(?)",
-                (name,)
-            )
+            cursor.execute(_SQL_GET_PERSON_BY_NAME, (name,))
             return [dict(row) for row in cursor.fetchall()]
             
     def update_person_seen(self, person_id: str):
         """Update last seen timestamp for a person."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE people SET last_seen = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (person_id,))
-            conn.commit()
+            cursor.execute(_SQL_UPDATE_PERSON_SEEN, (person_id,))
             
     def get_all_people(self) -> List[Dict[str, Any]]:
         """Get all known people."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM people ORDER BY last_seen DESC")
+            cursor.execute(_SQL_ALL_PEOPLE)
             return [dict(row) for row in cursor.fetchall()]
             
     # ============ CONVERSATIONS ============
@@ -171,16 +454,20 @@ class LongTermMemory:
         self,
         summary: str,
         person_id: Optional[str] = None,
-        full_transcript: Optional[str] = None
+        full_transcript: Optional[str] = None,
+        embedding: Optional[np.ndarray] = None
     ):
-        """Save a conversation summary."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO conversations (person_id, summary, full_transcript)
-                VALUES (?, ?, ?)
-            """, (person_id, summary, full_transcript))
-            conn.commit()
+        """
+        Save a conversation summary (written behind).
+        
+        Args:
+            embedding: Optional embedding of the summary, for semantic recall
+                in get_context_for_person()
+        """
+        self._write_q.put((
+            "conversation",
+            (person_id, summary, full_transcript, _embedding_blob(embedding))
+        ))
             
     def get_conversations_with(
         self,
@@ -188,14 +475,10 @@ class LongTermMemory:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Get recent conversations with a person."""
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM conversations
-                WHERE person_id = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (person_id, limit))
+            cursor.execute(_SQL_CONVERSATIONS_WITH, (person_id, limit))
             return [dict(row) for row in cursor.fetchall()]
             
     # ============ FACTS ============
@@ -206,7 +489,8 @@ class LongTermMemory:
         predicate: str,
         obj: str,
         source: Optional[str] = None,
-        confidence: float = 1.0
+        confidence: float = 1.0,
+        embedding: Optional[np.ndarray] = None
     ):
         """
         Add a fact (subject-predicate-object triple).
@@ -214,37 +498,53 @@ class LongTermMemory:
         Examples:
         - ("Florent", "aime", "le café")
         - ("Caroline", "travaille à", "Paris")
+        
+        The fact is written behind. embedding is an optional embedding of the
+        fact, for semantic recall in get_context_for_person().
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO facts (subject, predicate, object, source, confidence)
-                VALUES (?, ?, ?, ?, ?)
-            """, (subject, predicate, obj, source, confidence))
-            conn.commit()
+        self._write_q.put((
+            "fact",
+            (subject, predicate, obj, source, confidence, _embedding_blob(embedding))
+        ))
+            
+    def add_facts(self, rows: Iterable[Tuple[str, str, str, Optional[str], float]]):
+        """
+        Add several facts (written behind, committed together).
+        
+        Args:
+            rows: (subject, predicate, object, source, confidence) tuples,
+                optionally followed by an embedding
+        """
+        for subject, predicate, obj, source, confidence, *embedding in rows:
+            blob = _embedding_blob(embedding[0]) if embedding else None
+            self._write_q.put(("fact", (subject, predicate, obj, source, confidence, blob)))
             
     def get_facts_about(self, subject: str) -> List[Dict[str, Any]]:
         """Get all facts about a subject."""
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM facts
-                WHERE LOWER(subject) = LOWER(?)
-                ORDER BY confidence DESC, timestamp DESC
-            """, (subject,))
+            cursor.execute(_SQL_FACTS_ABOUT, (subject,))
             return [dict(row) for row in cursor.fetchall()]
             
     def search_facts(self, query: str) -> List[Dict[str, Any]]:
-        """Search facts by any field."""
+        """
+        Search facts by any field.
+        
+        Every word of the query must start a word of the fact (any field),
+        best matches first.
+        """
+        words = query.split()
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            pattern = f"%{query}%"
-            cursor.execute("""
-                SELECT * FROM facts
-                WHERE subject LIKE ? OR predicate LIKE ? OR object LIKE ?
-                ORDER BY confidence DESC, timestamp DESC
-                LIMIT 20
-            """, (pattern, pattern, pattern))
+            if self._fts and words:
+                # Quote each word so FTS5 syntax in the query is taken literally
+                match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+                cursor.execute(_SQL_SEARCH_FACTS_FTS, (match,))
+            else:
+                pattern = f"%{query}%"
+                cursor.execute(_SQL_SEARCH_FACTS, (pattern, pattern, pattern))
             return [dict(row) for row in cursor.fetchall()]
             
     # ============ EVENTS ============
@@ -256,16 +556,20 @@ class LongTermMemory:
         participants: Optional[List[str]] = None,
         importance: int = 5
     ):
-        """Save an important event."""
+        """Save an important event (written behind)."""
         participants_str = ",".join(participants) if participants else None
+        self._write_q.put(("event", (event_type, description, participants_str, importance)))
+            
+    def save_events(self, rows: Iterable[Tuple[str, str, Optional[List[str]], int]]):
+        """
+        Save several events (written behind, committed together).
         
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO events (event_type, description, participants, importance)
-                VALUES (?, ?, ?, ?)
-            """, (event_type, description, participants_str, importance))
-            conn.commit()
+        Args:
+            rows: (event_type, description, participants, importance) tuples
+        """
+        for event_type, description, participants, importance in rows:
+            participants_str = ",".join(participants) if participants else None
+            self._write_q.put(("event", (event_type, description, participants_str, importance)))
             
     def get_recent_events(
         self,
@@ -273,48 +577,122 @@ class LongTermMemory:
         min_importance: int = 1
     ) -> List[Dict[str, Any]]:
         """Get recent important events."""
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM events
-                WHERE importance >= ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (min_importance, limit))
+            cursor.execute(_SQL_RECENT_EVENTS, (min_importance, limit))
             return [dict(row) for row in cursor.fetchall()]
             
     # ============ CONTEXT BUILDING ============
     
-    def get_context_for_person(self, person_id: str) -> str:
+    def get_context_for_person(
+        self,
+        person_id: str,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> str:
         """
         Get contextual information about a person for LLM.
+        
+        The person, their top facts and their latest conversations are
+        fetched with a single query. With query_embedding (e.g. the embedded
+        user message), the facts and conversations most similar to it are
+        picked instead, among those stored with an embedding.
+        
+        Without query_embedding the text is cached until the next write.
         """
-        person = self.get_person(person_id)
+        self.flush()
+        with self._get_connection() as conn:
+            version = self._version
+            if query_embedding is None:
+                cached = self._ctx_cache.get(person_id)
+                if cached is not None and cached[0] == version:
+                    self._ctx_cache.move_to_end(person_id)
+                    return cached[1]
+                    
+            cursor = conn.cursor()
+            cursor.execute(_SQL_PERSON_CONTEXT, (person_id,))
+            person = cursor.fetchone()
+            
+            if person and query_embedding is not None:
+                cursor.execute(_SQL_FACT_EMBEDDINGS, (person['name'],))
+                similar_facts = _most_similar(cursor.fetchall(), query_embedding, 5)
+                cursor.execute(_SQL_CONVERSATION_EMBEDDINGS, (person_id,))
+                similar_convos = _most_similar(cursor.fetchall(), query_embedding, 3)
+            else:
+                similar_facts = similar_convos = []
+                
         if not person:
             return ""
             
         parts = [f"À propos de {person['name']}:"]
         
         # Master status
-        if person.get('is_master'):
+        if person['is_master']:
             parts.append(f"- C'est un de tes maîtres")
             
         # Notes
-        if person.get('notes'):
+        if person['notes']:
             parts.append(f"- Notes: {person['notes']}")
             
         # Facts
-        facts = self.get_facts_about(person['name'])
+        facts = similar_facts or json.loads(person['facts_json'])
         if facts:
-            facts_text = "; ".join([f"{f['predicate']} {f['object']}" for f in facts[:5]])
+            facts_text = "; ".join([f"{f['predicate']} {f['object']}" for f in facts])
             parts.append(f"- Tu sais que: {facts_text}")
             
         # Recent conversations
-        convos = self.get_conversations_with(person_id, limit=3)
+        convos = [c['summary'] for c in similar_convos] or json.loads(person['convos_json'])
         if convos:
             parts.append("- Conversations récentes:")
-            for c in convos:
-                parts.append(f"  * {c['summary']}")
+            for summary in convos:
+                parts.append(f"  * {summary}")
                 
-        return "\n".join(parts)
+        context = "\n".join(parts)
+        if query_embedding is None:
+            with self._lock:
+                self._ctx_cache[person_id] = (version, context)
+                self._ctx_cache.move_to_end(person_id)
+                if len(self._ctx_cache) > self.CONTEXT_CACHE_SIZE:
+                    self._ctx_cache.popitem(last=False)
+        return context
+            
+    # ============ ASYNC API ============
+    # The same reads run on a worker thread, so disk I/O doesn't block the
+    # event loop (the shared connection is already lock-protected). Writes
+    # behind (save_conversation, add_fact...) only queue a row: call them
+    # directly.
+    
+    async def add_person_async(
+        self,
+        person_id: str,
+        name: str,
+        is_master: bool = False,
+        notes: Optional[str] = None
+    ) -> None:
+        """Async version of add_person()."""
+        await asyncio.to_thread(self.add_person, person_id, name, is_master, notes)
+    
+    async def get_person_async(self, person_id: str) -> Optional[Dict[str, Any]]:
+        """Async version of get_person()."""
+        return await asyncio.to_thread(self.get_person, person_id)
+    
+    async def get_conversations_with_async(
+        self,
+        person_id: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Async version of get_conversations_with()."""
+        return await asyncio.to_thread(self.get_conversations_with, person_id, limit)
+    
+    async def get_facts_about_async(self, subject: str) -> List[Dict[str, Any]]:
+        """Async version of get_facts_about()."""
+        return await asyncio.to_thread(self.get_facts_about, subject)
+    
+    async def get_context_for_person_async(
+        self,
+        person_id: str,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> str:
+        """Async version of get_context_for_person()."""
+        return await asyncio.to_thread(self.get_context_for_person, person_id, query_embedding)
 
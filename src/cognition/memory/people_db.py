@@ -3,15 +3,33 @@ People Database for Rex-Brain.
 Handles face recognition and person identification.
 """
 
-import json
+import atexit
+import threading
+import time
 import uuid
 from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import numpy as np
 
+from src.utils.compat import dumps_bytes, loads
 from src.utils.logger import log
 
+# Approximate nearest-neighbour search for large databases (optional)
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+def _unit(embedding: np.ndarray) -> np.ndarray:
+    """Embedding as a flat float32 unit vector (so cosine = dot product)."""
+    e = np.asarray(embedding, dtype=np.float32).ravel()
+    n = np.linalg.norm(e)
+    if n > 0:
+        e = e / n
+    return e
+
 
 class PeopleDatabase:
     """
@@ -24,6 +42,11 @@ class PeopleDatabase:
     """
     
     SIMILARITY_THRESHOLD = 0.6  # Cosine similarity threshold for recognition
+    HIGH_CONFIDENCE = 0.85  # A match this good needs no look at other people
+    MAX_EMBEDDINGS = 10  # Per person; the oldest is replaced beyond that
+    ANN_MIN_EMBEDDINGS = 2000  # Below this, the exact scan is as fast as HNSW
+    SAVE_DELAY = 2.0  # Seconds to gather changes before writing them to disk
+    LAST_SEEN_SAVE_INTERVAL = 60.0  # Seconds between last_seen saves per person
     
     def __init__(self, data_dir: Optional[str] = None):
         """
@@ -42,7 +65,31 @@ class PeopleDatabase:
         
         # Load existing data
         self._people: Dict[str, Dict[str, Any]] = {}
-        self._embeddings: Dict[str, List[np.ndarray]] = {}  # person_id -> list of embeddings
+        
+        # All embeddings (unit vectors) as one (N, D) float32 array: row i
+        # belongs to person self._emb_owner[i]. A person with MAX_EMBEDDINGS
+        # rows uses them as a ring, _ring_head being the next one to replace
+        self._emb_matrix = np.empty((0, 0), dtype=np.float32)
+        self._emb_owner = np.empty(0, dtype=str)
+        self._ring_head: Dict[str, int] = {}
+        # HNSW index over _emb_matrix, built on first use then kept up to
+        # date. Its labels are not row numbers: _ann_row_of maps a label to
+        # its row (-1 once deleted), _ann_label_of a row to its label
+        self._ann = None
+        self._ann_row_of = np.empty(0, dtype=np.intp)
+        self._ann_label_of = np.empty(0, dtype=np.intp)
+        self._recent: Optional[Tuple[str, np.ndarray]] = None  # Last match and its rows
+        self._legacy_files: List[Path] = []  # Per-person .npy files to remove
+        
+        # Changes are saved by a timer (see _schedule_save); the lock keeps
+        # it from reading the data while another thread modifies it
+        self._lock = threading.RLock()
+        self._dirty_people = False
+        self._dirty_last_seen = False
+        self._dirty_embeddings = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._last_seen_saved: Dict[str, float] = {}  # person_id -> monotonic time
+        atexit.register(self.flush)
         
         self._load_data()
         
@@ -52,41 +99,237 @@ class PeopleDatabase:
         
         if people_file.exists():
             try:
-                with open(people_file, 'r', encoding='utf-8') as f:
-                    self._people = json.load(f)
+                with open(people_file, 'rb') as f:
+                    self._people = loads(f.read())
                 log(f"Loaded {len(self._people)} known people", "INFO")
             except Exception as e:
                 log(f"Error loading people data: {e}", "ERROR")
                 self._people = {}
                 
-        # Load embeddings
+        # last_seen values saved since people.json was last written
+        last_seen_file = self.data_dir / "last_seen.json"
+        if last_seen_file.exists():
+            try:
+                with open(last_seen_file, 'rb') as f:
+                    for person_id, last_seen in loads(f.read()).items():
+                        if person_id in self._people:
+                            self._people[person_id]["last_seen"] = last_seen
+            except Exception as e:
+                log(f"Error loading last seen times: {e}", "WARNING")
+                
+        # Load embeddings: all.npy holds every embedding as one (N, D)
+        # float32 array, owners.npy the person_id of each row
         embeddings_dir = self.data_dir / "embeddings"
-        if embeddings_dir.exists():
+        all_file = embeddings_dir / "all.npy"
+        owners_file = embeddings_dir / "owners.npy"
+        if all_file.exists() and owners_file.exists():
+            try:
+                # Memory-mapped: pages are read on first use, not at startup
+                matrix = np.load(all_file, mmap_mode='r', allow_pickle=False)
+                owners = np.load(owners_file, allow_pickle=False)
+                if len(matrix) != len(owners):
+                    raise ValueError(f"{len(matrix)} embeddings for {len(owners)} owners")
+                known = np.isin(owners, list(self._people))
+                if not known.all():
+                    matrix, owners = matrix[known], owners[known]
+                if len(owners):
+                    self._emb_matrix, self._emb_owner = matrix, owners
+            except Exception as e:
+                log(f"Error loading embeddings: {e}", "WARNING")
+                
+        elif embeddings_dir.exists():
+            # One file per person, written by older versions (converted to
+            # all.npy on the next save)
+            rows = []
+            owners = []
+            dim = None  # Set by the first file loaded; the others must match
             for person_id in self._people:
                 emb_file = embeddings_dir / f"{person_id}.npy"
                 if emb_file.exists():
                     try:
                         embeddings = np.load(emb_file, allow_pickle=True)
-                        self._embeddings[person_id] = list(embeddings)
+                        # Files saved before embeddings were normalized on
+                        # insert may hold raw vectors (normalizing is idempotent)
+                        file_rows = [_unit(e) for e in embeddings]
                     except Exception as e:
                         log(f"Error loading embeddings for {person_id}: {e}", "WARNING")
-                        
-    def _save_data(self):
-        """Save people data to disk."""
-        # Save people info
-        people_file = self.data_dir / "people.json"
-        with open(people_file, 'w', encoding='utf-8') as f:
-            json.dump(self._people, f, indent=2, default=str)
+                        continue
+                    if not file_rows:
+                        continue
+                    if dim is None:
+                        dim = file_rows[0].shape[0]
+                    if any(row.shape[0] != dim for row in file_rows):
+                        # Left on disk, not migrated
+                        log(f"Skipped embeddings for {person_id}: not {dim}-dimensional", "WARNING")
+                        continue
+                    rows.extend(file_rows)
+                    owners.extend([person_id] * len(file_rows))
+                    self._legacy_files.append(emb_file)
+            if rows:
+                self._emb_matrix = np.vstack(rows)
+                self._emb_owner = np.asarray(owners, dtype=str)
+                
+    def _row(self, embedding: np.ndarray) -> np.ndarray:
+        """Embedding as a stored row, checked against the stored dimension."""
+        row = _unit(embedding)
+        if len(self._emb_owner) and row.shape[0] != self._emb_matrix.shape[1]:
+            raise ValueError(
+                f"Face embedding has {row.shape[0]} dimensions, "
+                f"the database holds {self._emb_matrix.shape[1]}-dimensional ones"
+            )
+        return row
+        
+    def _append_embedding(self, person_id: str, row: np.ndarray):
+        """Add one row from _row() (copies the matrix, so never writes the mmap)."""
+        row = row[np.newaxis, :]
+        if len(self._emb_owner):
+            self._emb_matrix = np.concatenate((self._emb_matrix, row))
+        else:
+            self._emb_matrix = row
+        self._emb_owner = np.append(self._emb_owner, person_id)
+        self._ann_add(len(self._emb_owner) - 1)
+        self._recent = None
+        
+    def _replace_embedding(self, index: int, row: np.ndarray):
+        """Overwrite one stored row in place."""
+        if not self._emb_matrix.flags.writeable:
+            self._emb_matrix = np.array(self._emb_matrix)  # Off the mmap
+        self._emb_matrix[index] = row
+        if self._ann is not None:
+            label = self._ann_label_of[index]
+            self._ann.mark_deleted(label)
+            self._ann_row_of[label] = -1
+            self._ann_add(index)
+            
+    def _keep_rows(self, keep: np.ndarray):
+        """Drop the embedding rows where keep is False."""
+        self._emb_matrix = self._emb_matrix[keep]
+        self._emb_owner = self._emb_owner[keep]
+        if self._ann is not None:
+            for label in self._ann_label_of[~keep].tolist():
+                self._ann.mark_deleted(label)
+            # Remaining rows move up: renumber them
+            new_row = np.cumsum(keep) - 1
+            row_of = self._ann_row_of
+            alive = row_of >= 0
+            alive[alive] = keep[row_of[alive]]
+            self._ann_row_of = np.where(alive, new_row[np.maximum(row_of, 0)], -1)
+            self._ann_label_of = self._ann_label_of[keep]
+        self._recent = None
+        
+    def _get_ann(self):
+        """HNSW index over the stacked embeddings (built on first use)."""
+        if self._ann is None:
+            count, dim = self._emb_matrix.shape
+            index = hnswlib.Index(space='ip', dim=dim)
+            # Deleted slots are reused by later additions
+            index.init_index(max_elements=count, ef_construction=100, M=16, allow_replace_deleted=True)
+            index.add_items(self._emb_matrix, np.arange(count))
+            index.set_ef(50)
+            self._ann = index
+            self._ann_row_of = np.arange(count, dtype=np.intp)
+            self._ann_label_of = np.arange(count, dtype=np.intp)
+        return self._ann
+        
+    def _ann_add(self, index: int):
+        """Add stored row index to the HNSW index, if it is built."""
+        ann = self._ann
+        if ann is None:
+            return
+            
+        count = len(self._emb_owner)
+        if len(self._ann_row_of) > 2 * count:
+            # Mostly deleted labels: rebuild on next use (amortized)
+            self._ann = None
+            return
+            
+        if ann.get_current_count() >= ann.get_max_elements():
+            ann.resize_index(max(2 * ann.get_max_elements(), 1024))
+        label = len(self._ann_row_of)
+        ann.add_items(self._emb_matrix[index][np.newaxis, :], [label], replace_deleted=True)
+        self._ann_row_of = np.append(self._ann_row_of, index)
+        if index < len(self._ann_label_of):
+            self._ann_label_of[index] = label
+        else:
+            self._ann_label_of = np.append(self._ann_label_of, label)
+        
+    def _schedule_save(
+        self,
+        people: bool = True,
+        embeddings: bool = False,
+        last_seen: bool = False
+    ):
+        """
+        Mark data as changed and save it within SAVE_DELAY seconds.
+        
+        Args:
+            people: Whether people records changed
+            embeddings: Whether the embeddings changed
+            last_seen: Whether only last_seen times changed in the records
+        """
+        with self._lock:
+            self._dirty_people = self._dirty_people or people
+            self._dirty_embeddings = self._dirty_embeddings or embeddings
+            self._dirty_last_seen = self._dirty_last_seen or last_seen
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                
+    def flush(self):
+        """Write pending changes to disk now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not (self._dirty_people or self._dirty_embeddings or self._dirty_last_seen):
+                return
+            try:
+                self._save_data(
+                    people=self._dirty_people,
+                    embeddings=self._dirty_embeddings,
+                    last_seen=self._dirty_last_seen
+                )
+                self._dirty_people = self._dirty_embeddings = self._dirty_last_seen = False
+            except Exception as e:
+                log(f"Error saving people data: {e}", "ERROR")
+                
+    def _save_data(self, people: bool = True, embeddings: bool = True, last_seen: bool = False):
+        """Save the parts of the data that changed to disk."""
+        last_seen_file = self.data_dir / "last_seen.json"
+        if people:
+            # Save people info (last_seen included)
+            people_file = self.data_dir / "people.json"
+            with open(people_file, 'wb') as f:
+                f.write(dumps_bytes(self._people, indent=True))
+            last_seen_file.unlink(missing_ok=True)
+        elif last_seen:
+            # Only last_seen changed: a small file instead of every record
+            with open(last_seen_file, 'wb') as f:
+                f.write(dumps_bytes({
+                    person_id: info.get("last_seen")
+                    for person_id, info in self._people.items()
+                }))
+                
+        if not embeddings:
+            return
             
         # Save embeddings
         embeddings_dir = self.data_dir / "embeddings"
         embeddings_dir.mkdir(exist_ok=True)
         
-        for person_id, embeddings in self._embeddings.items():
-            if embeddings:
-                emb_file = embeddings_dir / f"{person_id}.npy"
-                np.save(emb_file, np.array(embeddings))
-                
+        # The matrix may be mapped from all.npy: write a new file and
+        # rename it over the old one instead of truncating the mapped file
+        for name, array in (("all.npy", self._emb_matrix), ("owners.npy", self._emb_owner)):
+            tmp_file = embeddings_dir / f"{name}.tmp"
+            with open(tmp_file, 'wb') as f:
+                np.save(f, array, allow_pickle=False)
+            tmp_file.replace(embeddings_dir / name)
+            
+        for emb_file in self._legacy_files:
+            emb_file.unlink(missing_ok=True)
+        self._legacy_files = []
+        
     def add_person(
         self,
         name: str,
@@ -106,19 +349,19 @@ class PeopleDatabase:
         """
         person_id = str(uuid.uuid4())[:8]
         
-        self._people[person_id] = {
-            "name": name,
-            "is_master": is_master,
-            "created": datetime.now().isoformat(),
-            "last_seen": datetime.now().isoformat()
-        }
-        
-        if embedding is not None:
-            self._embeddings[person_id] = [embedding]
-        else:
-            self._embeddings[person_id] = []
+        with self._lock:
+            row = self._row(embedding) if embedding is not None else None
+            self._people[person_id] = {
+                "name": name,
+                "is_master": is_master,
+                "created": datetime.now().isoformat(),
+                "last_seen": datetime.now().isoformat()
+            }
             
-        self._save_data()
+            if row is not None:
+                self._append_embedding(person_id, row)
+                
+        self._schedule_save(embeddings=embedding is not None)
         log(f"Added new person: {name} (ID: {person_id})", "SUCCESS")
         
         return person_id
@@ -135,17 +378,18 @@ class PeopleDatabase:
             log(f"Person {person_id} not found", "WARNING")
             return
             
-        if person_id not in self._embeddings:
-            self._embeddings[person_id] = []
-            
-        # Limit number of embeddings per person
-        max_embeddings = 10
-        if len(self._embeddings[person_id]) >= max_embeddings:
-            # Remove oldest
-            self._embeddings[person_id].pop(0)
+        with self._lock:
+            row = self._row(embedding)
+            rows = np.flatnonzero(self._emb_owner == person_id)
+            if len(rows) < self.MAX_EMBEDDINGS:
+                self._append_embedding(person_id, row)
+            else:
+                # Full: overwrite the oldest row in place
+                head = self._ring_head.get(person_id, 0) % len(rows)
+                self._replace_embedding(rows[head], row)
+                self._ring_head[person_id] = (head + 1) % len(rows)
             
-        self._embeddings[person_id].append(embedding)
-        self._save_data()
+        self._schedule_save(people=False, embeddings=True)
         
     def identify(self, embedding: np.ndarray) -> Optional[Tuple[str, str, float]]:
         """
@@ -157,45 +401,109 @@ class PeopleDatabase:
         Returns:
             (person_id, name, confidence) or None if no match
         """
-        best_match = None
-        best_score = 0.0
+        with self._lock:
+            return self._identify(embedding)
+            
+    def identify_batch(
+        self,
+        embeddings: np.ndarray,
+        tile: Optional[int] = None
+    ) -> List[Optional[Tuple[str, str, float]]]:
+        """
+        Identify every face of a frame with one matrix product.
         
-        for person_id, stored_embeddings in self._embeddings.items():
-            if not stored_embeddings:
-                continue
-                
-            # Calculate similarity with each stored embedding
-            for stored_emb in stored_embeddings:
-                similarity = self._cosine_similarity(embedding, stored_emb)
+        Args:
+            embeddings: (faces, dim) array of face embeddings
+            tile: Stored embeddings scored per block (bounds the working set
+                on large databases); all at once if None
+            
+        Returns:
+            One (person_id, name, confidence) or None per face, in order
+        """
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+        
+        with self._lock:
+            count = len(self._emb_owner)
+            if not count or not len(queries):
+                return [None] * len(queries)
                 
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = person_id
+            if hnswlib is not None and count >= self.ANN_MIN_EMBEDDINGS:
+                labels, distances = self._get_ann().knn_query(queries, k=1)
+                best = self._ann_row_of[labels[:, 0].astype(np.intp)]
+                best_scores = 1.0 - distances[:, 0]
+            elif tile is None or tile >= count:
+                scores = queries @ self._emb_matrix.T
+                best = scores.argmax(axis=1)
+                best_scores = scores[np.arange(len(queries)), best]
+            else:
+                # Running best per face over blocks of stored embeddings
+                best = np.zeros(len(queries), dtype=np.intp)
+                best_scores = np.full(len(queries), -np.inf, dtype=np.float32)
+                for start in range(0, count, tile):
+                    scores = queries @ self._emb_matrix[start:start + tile].T
+                    block_best = scores.argmax(axis=1)
+                    block_scores = scores[np.arange(len(queries)), block_best]
+                    better = block_scores > best_scores
+                    best[better] = block_best[better] + start
+                    best_scores[better] = block_scores[better]
                     
-        if best_match and best_score >= self.SIMILARITY_THRESHOLD:
-            name = self._people[best_match]["name"]
-            
-            # Update last seen
-            self._people[best_match]["last_seen"] = datetime.now().isoformat()
-            self._save_data()
+            results = []
+            for index, score in zip(best.tolist(), best_scores.tolist()):
+                if score >= self.SIMILARITY_THRESHOLD:
+                    results.append(self._matched(str(self._emb_owner[index]), score))
+                else:
+                    results.append(None)
+            return results
             
-            return (best_match, name, best_score)
+    def _identify(self, embedding: np.ndarray) -> Optional[Tuple[str, str, float]]:
+        """identify(), with the lock held."""
+        if not len(self._emb_owner):
+            return None
             
-        return None
+        query = _unit(embedding)
         
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two embeddings."""
-        a = a.flatten()
-        b = b.flatten()
+        # Faces are identified frame after frame: try the person matched last
+        # time first, and skip the full scan if they match with confidence
+        if self._recent is not None:
+            person_id, rows = self._recent
+            score = float((self._emb_matrix[rows] @ query).max())
+            if score >= self.HIGH_CONFIDENCE:
+                return self._matched(person_id, score)
+                
+        if hnswlib is not None and len(self._emb_owner) >= self.ANN_MIN_EMBEDDINGS:
+            # Inner-product distance is 1 - cosine for unit vectors
+            labels, distances = self._get_ann().knn_query(query, k=1)
+            best = int(self._ann_row_of[labels[0, 0]])
+            best_score = 1.0 - float(distances[0, 0])
+        else:
+            # Cosine similarity with every stored (unit) embedding in one product
+            scores = self._emb_matrix @ query
+            best = int(scores.argmax())
+            best_score = float(scores[best])
+        best_match = str(self._emb_owner[best])
         
-        dot_product = np.dot(a, b)
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
+        if best_score >= self.SIMILARITY_THRESHOLD:
+            if self._recent is None or self._recent[0] != best_match:
+                self._recent = (best_match, np.flatnonzero(self._emb_owner == best_match))
+            return self._matched(best_match, best_score)
+            
+        return None
         
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
+    def _matched(self, person_id: str, score: float) -> Tuple[str, str, float]:
+        """Record a successful identification and build its result."""
+        # Update last seen (in memory; saved along with other changes,
+        # or at most once a minute per person on its own)
+        self._people[person_id]["last_seen"] = datetime.now().isoformat()
+        now = time.monotonic()
+        last_saved = self._last_seen_saved.get(person_id)
+        if last_saved is None or now - last_saved >= self.LAST_SEEN_SAVE_INTERVAL:
+            self._last_seen_saved[person_id] = now
+            self._schedule_save(people=False, last_seen=True)
             
-        return dot_product / (norm_a * norm_b)
+        return (person_id, self._people[person_id]["name"], score)
         
     def get_person(self, person_id: str) -> Optional[Dict[str, Any]]:
         """Get person info by ID."""
@@ -218,26 +526,25 @@ class PeopleDatabase:
         if person_id not in self._people:
             return
             
-        for key, value in kwargs.items():
-            if key in ["name", "is_master", "notes"]:
-                self._people[person_id][key] = value
-                
-        self._save_data()
+        with self._lock:
+            for key, value in kwargs.items():
+                if key in ["name", "is_master", "notes"]:
+                    self._people[person_id][key] = value
+                    
+        self._schedule_save()
         
     def delete_person(self, person_id: str):
         """Delete a person from the database."""
-        if person_id in self._people:
-            name = self._people[person_id]["name"]
-            del self._people[person_id]
-            
-        if person_id in self._embeddings:
-            del self._embeddings[person_id]
-            
-            # Delete embedding file
-            emb_file = self.data_dir / "embeddings" / f"{person_id}.npy"
-            if emb_file.exists():
-                emb_file.unlink()
+        with self._lock:
+            if person_id in self._people:
+                name = self._people[person_id]["name"]
+                del self._people[person_id]
+                
+            mine = self._emb_owner == person_id
+            if mine.any():
+                self._keep_rows(~mine)
+            self._ring_head.pop(person_id, None)
                 
-        self._save_data()
+        self._schedule_save(embeddings=True)
         log(f"Deleted person: {name}", "INFO")
 
@@ -3,13 +3,13 @@ Short-term memory for Rex-Brain.
 Handles recent conversation context and events.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import deque
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationMessage:
     """A message in a conversation."""
     role: str  # 'user' or 'assistant'
@@ -18,7 +18,7 @@ class ConversationMessage:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """An event that happened."""
     event_type: str  # 'person_arrived', 'person_left', 'action', etc.
@@ -38,6 +38,8 @@ class ShortTermMemory:
     - Active speaker
     """
     
+    RECENT_EVENTS_WINDOW = timedelta(minutes=5)  # Events shown in the summary
+    
     def __init__(self, max_messages: int = 20, max_events: int = 50):
         """
         Initialize short-term memory.
@@ -51,6 +53,8 @@ class ShortTermMemory:
         
         # Conversation history
         self._messages: deque = deque(maxlen=max_messages)
+        # The same messages in LLM API format, built once per message
+        self._llm_view: deque = deque(maxlen=max_messages)
         
         # Event history
         self._events: deque = deque(maxlen=max_events)
@@ -58,10 +62,16 @@ class ShortTermMemory:
         # Current state
         self._current_scene: Optional[str] = None
         self._visible_people: List[str] = []
+        self._visible_set: Set[str] = set()  # Same people, for membership tests
         self._active_speaker: Optional[str] = None
         self._conversation_active: bool = False
         self._conversation_start: Optional[datetime] = None
         
+        # get_context_summary() result as (state version, expiry, text);
+        # _state_version is bumped whenever the summarized state changes
+        self._state_version = 0
+        self._summary_cache: Optional[Tuple[int, Optional[datetime], str]] = None
+        
     def add_message(
         self,
         role: str,
@@ -75,6 +85,7 @@ class ShortTermMemory:
             speaker_name=speaker_name
         )
         self._messages.append(message)
+        self._llm_view.append({"role": role, "content": content})
         
     def add_event(
         self,
@@ -89,6 +100,7 @@ class ShortTermMemory:
             data=data or {}
         )
         self._events.append(event)
+        self._state_version += 1
         
     def get_messages(self, limit: Optional[int] = None) -> List[ConversationMessage]:
         """Get recent messages."""
@@ -99,10 +111,7 @@ class ShortTermMemory:
         
     def get_messages_for_llm(self) -> List[Dict[str, str]]:
         """Get messages formatted for LLM API."""
-        return [
-            {"role": msg.role, "content": msg.content}
-            for msg in self._messages
-        ]
+        return list(self._llm_view)
         
     def get_events(
         self,
@@ -110,25 +119,25 @@ class ShortTermMemory:
         event_type: Optional[str] = None
     ) -> List[Event]:
         """Get events, optionally filtered."""
-        events = list(self._events)
-        
-        if since:
-            events = [e for e in events if e.timestamp >= since]
-            
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-            
-        return events
+        # One pass over the deque, no intermediate lists
+        return [
+            e for e in self._events
+            if (not since or e.timestamp >= since)
+            and (not event_type or e.event_type == event_type)
+        ]
         
     def set_scene(self, description: str):
         """Update current scene description."""
         self._current_scene = description
+        self._state_version += 1
         
     def set_visible_people(self, people: List[str]):
         """Update list of visible people."""
+        new_set = set(people)
+        
         # Check for arrivals
         for person in people:
-            if person not in self._visible_people:
+            if person not in self._visible_set:
                 self.add_event(
                     "person_arrived",
                     f"{person} est apparu(e)",
@@ -137,7 +146,7 @@ class ShortTermMemory:
                 
         # Check for departures
         for person in self._visible_people:
-            if person not in people:
+            if person not in new_set:
                 self.add_event(
                     "person_left",
                     f"{person} est parti(e)",
@@ -145,11 +154,14 @@ class ShortTermMemory:
                 )
                 
         self._visible_people = people
+        self._visible_set = new_set
+        self._state_version += 1
         
     def set_active_speaker(self, speaker: Optional[str]):
         """Update active speaker."""
         if speaker != self._active_speaker:
             self._active_speaker = speaker
+            self._state_version += 1
             
     def start_conversation(self):
         """Mark start of a conversation."""
@@ -172,7 +184,18 @@ class ShortTermMemory:
         return datetime.now() - self._conversation_start
         
     def get_context_summary(self) -> str:
-        """Get a summary of current context for LLM."""
+        """
+        Get a summary of current context for LLM.
+        
+        The text is cached until the state changes or, when it lists recent
+        events, until the oldest of them leaves the time window.
+        """
+        now = datetime.now()
+        cached = self._summary_cache
+        if cached is not None and cached[0] == self._state_version:
+            if cached[1] is None or now < cached[1]:
+                return cached[2]
+                
         parts = []
         
         # Scene
@@ -188,20 +211,27 @@ class ShortTermMemory:
             parts.append(f"Qui parle: {self._active_speaker}")
             
         # Recent events
-        recent_events = self.get_events(since=datetime.now() - timedelta(minutes=5))
+        recent_events = self.get_events(since=now - self.RECENT_EVENTS_WINDOW)
+        expiry = None
         if recent_events:
             events_text = "; ".join([e.description for e in recent_events[-5:]])
             parts.append(f"Événements récents: {events_text}")
+            expiry = min(e.timestamp for e in recent_events) + self.RECENT_EVENTS_WINDOW
             
-        return "\n".join(parts) if parts else "Aucun contexte particulier."
+        summary = "\n".join(parts) if parts else "Aucun contexte particulier."
+        self._summary_cache = (self._state_version, expiry, summary)
+        return summary
         
     def clear(self):
         """Clear all short-term memory."""
         self._messages.clear()
+        self._llm_view.clear()
         self._events.clear()
         self._current_scene = None
         self._visible_people = []
+        self._visible_set = set()
         self._active_speaker = None
         self._conversation_active = False
         self._conversation_start = None
+        self._state_version += 1
 
@@ -4,10 +4,13 @@ Handles complex multi-step actions with goal tracking.
 """
 
 import asyncio
+import bisect
+import functools
+import re
 from dataclasses import dataclass, field
-from datetime import datetime
+import time
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class MissionStatus(Enum):
@@ -28,7 +31,53 @@ class StepStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+# Status -> value, for to_dict() (a dict lookup is cheaper than Enum.value)
+_STATUS_VALUE = {status: status.value for status in MissionStatus}
+_STEP_STATUS_VALUE = {status: status.value for status in StepStatus}
+
+
+# Command detection keywords by template (the first template listed wins
+# when several match)
+_COMMAND_KEYWORDS = {
+    "au_pied": ["au pied", "aux pieds", "à mes pieds"],
+    "viens_ici": ["viens ici", "viens là", "approche", "viens"],
+    "assis": ["assis", "assied", "assois"],
+    "couché": ["couché", "couche", "allonge"],
+    "debout": ["debout", "lève", "relève"],
+    "donne_la_patte": ["donne la patte", "la patte", "ta patte"],
+    "fais_le_beau": ["fais le beau", "le beau", "supplie"],
+    "tourne": ["tourne", "fais un tour", "pirouette"],
+    "recule": ["recule", "en arrière", "va en arrière"],
+    "salue": ["salue", "dis bonjour", "fais coucou"]
+}
+
+# keyword -> (template rank, template name)
+_KEYWORD_TEMPLATES = {
+    keyword: (rank, template_name)
+    for rank, (template_name, keywords) in enumerate(_COMMAND_KEYWORDS.items())
+    for keyword in keywords
+}
+
+# All keywords in one pass; each must start a word ("élève" is not "lève")
+# but may be inflected ("assieds-toi")
+_COMMAND_RE = re.compile(
+    "|".join(r"\b" + re.escape(keyword) for keyword in _KEYWORD_TEMPLATES)
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_command(text_lower: str) -> Optional[str]:
+    """Template for lowercased text (cached: short commands repeat a lot)."""
+    best = None
+    for match in _COMMAND_RE.finditer(text_lower):
+        found = _KEYWORD_TEMPLATES[match.group()]
+        if best is None or found < best:
+            best = found
+            
+    return best[1] if best else None
+
+
+@dataclass(slots=True)
 class MissionStep:
     """A single step in a mission."""
     action: str  # e.g., "walk_to_person", "lie_down", "sit", "speak"
@@ -36,20 +85,21 @@ class MissionStep:
     done_condition: Optional[str] = None  # e.g., "distance < 0.5", "pose == lying"
     timeout_seconds: float = 30.0
     status: StepStatus = StepStatus.PENDING
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    # time.monotonic() values
+    started_at_mono: Optional[float] = None
+    completed_at_mono: Optional[float] = None
     error: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "action": self.action,
             "parameters": self.parameters,
-            "status": self.status.value,
+            "status": _STEP_STATUS_VALUE[self.status],
             "error": self.error
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Mission:
     """A mission with a goal and multiple steps."""
     id: str
@@ -58,11 +108,20 @@ class Mission:
     steps: List[MissionStep] = field(default_factory=list)
     status: MissionStatus = MissionStatus.PENDING
     current_step_index: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    # time.monotonic() values
+    created_at_mono: float = field(default_factory=time.monotonic)
+    started_at_mono: Optional[float] = None
+    completed_at_mono: Optional[float] = None
     priority: int = 1  # Higher = more important
     interruptible: bool = True  # Can be interrupted by higher priority mission
+    # Steps completed so far, counted by MissionManager._complete_step()
+    _completed_count: int = field(default=0, init=False, repr=False, compare=False)
+    # to_dict() result, valid while _to_dict_version is unchanged (bumped by
+    # MissionManager whenever it changes the mission or its steps)
+    _to_dict_version: int = field(default=0, init=False, repr=False, compare=False)
+    _to_dict_cache: Optional[Tuple[int, Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     @property
     def current_step(self) -> Optional[MissionStep]:
@@ -76,19 +135,69 @@ class Mission:
         """Get mission progress as 0.0-1.0."""
         if not self.steps:
             return 1.0
-        completed = sum(1 for s in self.steps if s.status == StepStatus.COMPLETED)
-        return completed / len(self.steps)
+        return self._completed_count / len(self.steps)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        cached = self._to_dict_cache
+        if cached is not None and cached[0] == self._to_dict_version:
+            return cached[1]
+            
+        result = {
             "id": self.id,
             "goal": self.goal,
             "reason": self.reason,
-            "status": self.status.value,
+            "status": _STATUS_VALUE[self.status],
             "progress": self.progress,
             "current_step": self.current_step.to_dict() if self.current_step else None,
             "steps": [s.to_dict() for s in self.steps]
         }
+        self._to_dict_cache = (self._to_dict_version, result)
+        return result
+
+
+def _compile_template(template: Dict[str, Any]) -> Callable[[str], Tuple[str, List[MissionStep]]]:
+    """
+    Build a function making a template's goal and steps for a target.
+    
+    Templates are static: which values need the target, the done
+    conditions and the timeouts are all resolved here, once.
+    """
+    # Text around each "{target}", so building is target.join(parts); a
+    # single part means the text does not use the target
+    goal_parts = tuple(template["goal"].split("{target}"))
+    specs = []
+    for step in template["steps"]:
+        const_params = {}
+        target_params = []
+        for key, value in step.get("parameters", {}).items():
+            if isinstance(value, str) and "{target}" in value:
+                target_params.append((key, tuple(value.split("{target}"))))
+            else:
+                const_params[key] = value
+        specs.append((
+            step["action"],
+            const_params,
+            tuple(target_params),
+            step.get("done_condition"),
+            step.get("timeout_seconds", 30.0)
+        ))
+        
+    def build(target: str) -> Tuple[str, List[MissionStep]]:
+        steps = []
+        for action, const_params, target_params, done_condition, timeout_seconds in specs:
+            parameters = const_params.copy()
+            for key, parts in target_params:
+                parameters[key] = target.join(parts)
+            steps.append(MissionStep(
+                action=action,
+                parameters=parameters,
+                done_condition=done_condition,
+                timeout_seconds=timeout_seconds
+            ))
+        goal = target.join(goal_parts) if len(goal_parts) > 1 else goal_parts[0]
+        return goal, steps
+        
+    return build
 
 
 class MissionManager:
@@ -177,7 +286,11 @@ class MissionManager:
             log_callback: Callback for logging
         """
         self._log_callback = log_callback
-        self._mission_queue: List[Mission] = []
+        # (priority, -seq, mission) sorted ascending, so the next mission
+        # (highest priority, then first queued) is at the end. seq also
+        # keeps missions from being compared
+        self._mission_queue: List[Tuple[int, int, Mission]] = []
+        self._queue_seq = 0
         self._current_mission: Optional[Mission] = None
         self._mission_counter = 0
         self._robot_state: Dict[str, Any] = {}  # Current robot state for condition checking
@@ -185,6 +298,12 @@ class MissionManager:
         # Action executor callback (will be set by brain)
         self._action_executor: Optional[Callable] = None
         
+        # Template name -> builder of its goal and steps for a target
+        self._template_builders = {
+            name: _compile_template(template)
+            for name, template in self.ACTION_TEMPLATES.items()
+        }
+        
     def _log(self, message: str, level: str = "INFO"):
         """Log a message."""
         if self._log_callback:
@@ -232,8 +351,8 @@ class MissionManager:
         Returns:
             Created mission or None if template not found
         """
-        template = self.ACTION_TEMPLATES.get(template_name)
-        if not template:
+        build = self._template_builders.get(template_name)
+        if not build:
             self._log(f"Unknown template: {template_name}", "WARNING")
             return None
             
@@ -241,27 +360,8 @@ class MissionManager:
         self._mission_counter += 1
         mission_id = f"mission_{self._mission_counter}"
         
-        # Create steps from template
-        steps = []
-        for step_template in template["steps"]:
-            # Replace {target} in parameters
-            params = {}
-            for key, value in step_template.get("parameters", {}).items():
-                if isinstance(value, str) and "{target}" in value:
-                    params[key] = value.replace("{target}", target)
-                else:
-                    params[key] = value
-                    
-            step = MissionStep(
-                action=step_template["action"],
-                parameters=params,
-                done_condition=step_template.get("done_condition"),
-                timeout_seconds=step_template.get("timeout_seconds", 30.0)
-            )
-            steps.append(step)
-            
         # Create mission
-        goal = template["goal"].replace("{target}", target)
+        goal, steps = build(target)
         mission = Mission(
             id=mission_id,
             goal=goal,
@@ -319,6 +419,39 @@ class MissionManager:
         Returns:
             True if added, False if rejected
         """
+        if self._admit_mission(mission):
+            self._start_mission(mission)
+        return True
+    
+    async def run_inline(self, mission: Mission) -> bool:
+        """
+        Add a mission, awaiting it directly if it has a single step.
+        
+        A single-step mission that starts right away runs its action in the
+        caller's coroutine instead of a separate task. Anything else goes
+        through add_mission().
+        
+        Args:
+            mission: Mission to add
+            
+        Returns:
+            True if added, False if rejected
+        """
+        if len(mission.steps) != 1 or not self._action_executor:
+            return self.add_mission(mission)
+            
+        if self._admit_mission(mission):
+            self._start_mission(mission, inline=True)
+            await self._execute_step(mission.steps[0])
+        return True
+    
+    def _admit_mission(self, mission: Mission) -> bool:
+        """
+        Make room for a new mission or queue it.
+        
+        Returns:
+            True if the mission should start now, False if it was queued
+        """
         # Check if we should interrupt current mission
         if self._current_mission:
             if mission.priority > self._current_mission.priority and self._current_mission.interruptible:
@@ -326,40 +459,46 @@ class MissionManager:
                 self._interrupt_current_mission()
             else:
                 # Add to queue
-                self._mission_queue.append(mission)
-                self._mission_queue.sort(key=lambda m: -m.priority)
+                self._push_mission(mission)
                 self._log(f"📥 Mission en queue: {mission.goal} (#{len(self._mission_queue)})", "INFO")
-                return True
+                return False
                 
         # Start immediately if no current mission
-        self._start_mission(mission)
         return True
     
-    def _start_mission(self, mission: Mission):
-        """Start a mission."""
+    def _push_mission(self, mission: Mission):
+        """Queue a mission by priority."""
+        self._queue_seq += 1
+        bisect.insort(self._mission_queue, (mission.priority, -self._queue_seq, mission))
+        
+    def _start_mission(self, mission: Mission, inline: bool = False):
+        """Start a mission (the caller runs the first step if inline)."""
         self._current_mission = mission
         mission.status = MissionStatus.IN_PROGRESS
-        mission.started_at = datetime.now()
+        mission.started_at_mono = time.monotonic()
+        mission._to_dict_version += 1
         
         self._log(f"🚀 Mission démarrée: {mission.goal}", "SUCCESS")
         
         # Start first step
         if mission.steps:
-            self._start_step(mission.steps[0])
+            self._start_step(mission.steps[0], inline)
             
-    def _start_step(self, step: MissionStep):
-        """Start a mission step."""
+    def _start_step(self, step: MissionStep, inline: bool = False):
+        """Start a mission step (the caller runs it if inline)."""
         step.status = StepStatus.IN_PROGRESS
-        step.started_at = datetime.now()
+        step.started_at_mono = time.monotonic()
         
         mission = self._current_mission
+        if mission:
+            mission._to_dict_version += 1
         step_num = mission.current_step_index + 1 if mission else "?"
         total_steps = len(mission.steps) if mission else "?"
         
         self._log(f"▶️ Étape {step_num}/{total_steps}: {step.action}", "INFO")
         
         # Execute the action
-        if self._action_executor:
+        if self._action_executor and not inline:
             asyncio.create_task(self._execute_step(step))
             
     async def _execute_step(self, step: MissionStep):
@@ -379,8 +518,9 @@ class MissionManager:
             
     def _complete_step(self, step: MissionStep):
         """Mark a step as completed and move to next."""
+        newly_completed = step.status != StepStatus.COMPLETED
         step.status = StepStatus.COMPLETED
-        step.completed_at = datetime.now()
+        step.completed_at_mono = time.monotonic()
         
         self._log(f"✅ Étape terminée: {step.action}", "SUCCESS")
         
@@ -388,7 +528,10 @@ class MissionManager:
             return
             
         # Move to next step
+        if newly_completed:
+            self._current_mission._completed_count += 1
         self._current_mission.current_step_index += 1
+        self._current_mission._to_dict_version += 1
         
         if self._current_mission.current_step_index >= len(self._current_mission.steps):
             # Mission completed
@@ -410,6 +553,7 @@ class MissionManager:
         # TODO: Add retry logic or alternative paths
         if self._current_mission:
             self._current_mission.status = MissionStatus.FAILED
+            self._current_mission._to_dict_version += 1
             self._log(f"❌ Mission échouée: {self._current_mission.goal}", "ERROR")
             self._current_mission = None
             self._start_next_mission()
@@ -420,7 +564,8 @@ class MissionManager:
             return
             
         self._current_mission.status = MissionStatus.COMPLETED
-        self._current_mission.completed_at = datetime.now()
+        self._current_mission.completed_at_mono = time.monotonic()
+        self._current_mission._to_dict_version += 1
         
         self._log(f"🎉 Mission accomplie: {self._current_mission.goal}", "SUCCESS")
         
@@ -433,11 +578,12 @@ class MissionManager:
             return
             
         self._current_mission.status = MissionStatus.CANCELLED
+        self._current_mission._to_dict_version += 1
         self._log(f"⏸️ Mission interrompue: {self._current_mission.goal}", "WARNING")
         
         # Put back in queue with lower priority
         self._current_mission.priority -= 1
-        self._mission_queue.append(self._current_mission)
+        self._push_mission(self._current_mission)
         self._current_mission = None
         
     def _start_next_mission(self):
@@ -446,13 +592,14 @@ class MissionManager:
             self._log("📭 Plus de missions en attente", "INFO")
             return
             
-        next_mission = self._mission_queue.pop(0)
+        _, _, next_mission = self._mission_queue.pop()
         self._start_mission(next_mission)
         
     def cancel_all(self):
         """Cancel current mission and clear queue."""
         if self._current_mission:
             self._current_mission.status = MissionStatus.CANCELLED
+            self._current_mission._to_dict_version += 1
             self._log(f"🛑 Mission annulée: {self._current_mission.goal}", "WARNING")
             self._current_mission = None
             
@@ -467,39 +614,19 @@ class MissionManager:
         return {
             "current_mission": self._current_mission.to_dict() if self._current_mission else None,
             "queue_size": len(self._mission_queue),
-            "queue": [m.to_dict() for m in self._mission_queue[:3]]  # Show first 3
+            "queue": [m.to_dict() for _, _, m in reversed(self._mission_queue[-3:])]  # Show first 3
         }
     
-    def detect_command(self, text: str) -> Optional[str]:
+    def detect_command(self, text: str, text_lower: Optional[str] = None) -> Optional[str]:
         """
         Detect if text contains a known command.
         
         Args:
             text: Input text
+            text_lower: text.lower(), if the caller already computed it
             
         Returns:
             Template name if found, None otherwise
         """
-        text_lower = text.lower()
-        
-        # Command detection patterns
-        patterns = {
-            "au_pied": ["au pied", "aux pieds", "à mes pieds"],
-            "viens_ici": ["viens ici", "viens là", "approche", "viens"],
-            "assis": ["assis", "assied", "assois"],
-            "couché": ["couché", "couche", "allonge"],
-            "debout": ["debout", "lève", "relève"],
-            "donne_la_patte": ["donne la patte", "la patte", "ta patte"],
-            "fais_le_beau": ["fais le beau", "le beau", "supplie"],
-            "tourne": ["tourne", "fais un tour", "pirouette"],
-            "recule": ["recule", "en arrière", "va en arrière"],
-            "salue": ["salue", "dis bonjour", "fais coucou"]
-        }
-        
-        for template_name, keywords in patterns.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return template_name
-                    
-        return None
+        return _detect_command(text.lower() if text_lower is None else text_lower)
 
@@ -268,33 +268,51 @@ class RexBrainApp(App):
                 emotion_callback=self._on_emotion
             )
             
-            # Update UI based on brain state
-            self.body_connected = self.brain.has_body
-            self._update_connection_display()
-            
-            robot_name = self.config.get('robot', {}).get('name', 'Néo')
-            self.status_text = f"{robot_name} is awake!"
-            self.status_label.text = self.status_text
-            
-            self.log("Rex Brain initialized!", "SUCCESS")
-            
-            # Start the main loop
-            Clock.schedule_interval(self._main_loop, 0.5)
-            
-            # Start eye blink timer
-            Clock.schedule_interval(self._random_blink, 4.0)
-            
-            # Start audio listening
-            Clock.schedule_once(self._start_audio, 2.0)
-            
-            # Say hello
-            Clock.schedule_once(self._say_hello, 3.0)
+            # Subsystem init runs in a background thread so the UI keeps
+            # drawing; startup continues in _on_brain_ready
+            import threading
+            def run_init():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    loop.run_until_complete(self.brain.init_subsystems())
+                    Clock.schedule_once(self._on_brain_ready, 0)
+                except Exception as e:
+                    Clock.schedule_once(lambda dt, err=e: self.log(f"Brain init error: {err}", "ERROR"), 0)
+                finally:
+                    loop.close()
+                    
+            threading.Thread(target=run_init, daemon=True).start()
             
         except Exception as e:
             self.log(f"Brain init error: {e}", "ERROR")
             import traceback
             self.log(traceback.format_exc(), "ERROR")
             
+    def _on_brain_ready(self, dt):
+        """Finish startup once the brain subsystems are initialized."""
+        # Update UI based on brain state
+        self.body_connected = self.brain.has_body
+        self._update_connection_display()
+        
+        robot_name = self.config.get('robot', {}).get('name', 'Néo')
+        self.status_text = f"{robot_name} is awake!"
+        self.status_label.text = self.status_text
+        
+        self.log("Rex Brain initialized!", "SUCCESS")
+        
+        # Start the main loop
+        Clock.schedule_interval(self._main_loop, 0.5)
+        
+        # Start eye blink timer
+        Clock.schedule_interval(self._random_blink, 4.0)
+        
+        # Start audio listening
+        Clock.schedule_once(self._start_audio, 2.0)
+        
+        # Say hello
+        Clock.schedule_once(self._say_hello, 3.0)
+        
     def _update_connection_display(self):
         """Update the connection status display."""
         if self.connection_label:
@@ -313,17 +331,9 @@ class RexBrainApp(App):
         if self._tick_count % 10 == 0:
             self.log(f"♥ Tick {self._tick_count} - Rex is alive", "DEBUG")
             
-        # Run brain tick
-        if self.brain:
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(self.brain.tick())
-                loop.close()
-            except Exception as e:
-                if "no running event loop" not in str(e):
-                    self.log(f"Tick error: {e}", "DEBUG")
-                    
+        # No brain.tick() here: it has no periodic work left, and running it
+        # meant building an event loop on the UI thread every tick
+        
     def _random_blink(self, dt):
         """Make eyes blink randomly."""
         if self.eyes_display and random.random() < 0.3:  # 30% chance to blink
@@ -417,9 +427,23 @@ class RexBrainApp(App):
                 pass
 
 
+def install_fast_event_loop():
+    """Use uvloop for the asyncio loops on desktop (not available on Android)."""
+    if platform == 'android':
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    # Every asyncio.new_event_loop() in the app now returns a uvloop loop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    log("Using uvloop event loop", "DEBUG")
+
+
 def main():
     """Main entry point."""
     setup_logger()
+    install_fast_event_loop()
     RexBrainApp().run()
 
 
@@ -12,7 +12,7 @@ from datetime import datetime
 from dataclasses import dataclass
 
 from src.utils.config import get_api_key
-from src.utils.logger import log
+from src.utils.logger import log, log_exception
 
 
 @dataclass
@@ -164,9 +164,7 @@ class AudioProcessor:
             self._log("✅ Audio processor fully started!", "SUCCESS")
             
         except Exception as e:
-            self._log(f"❌ AudioProcessor.start() FAILED: {e}", "ERROR")
-            import traceback
-            self._log(f"❌ Traceback: {traceback.format_exc()}", "ERROR")
+            log_exception(f"❌ AudioProcessor.start() FAILED: {e}", self._log_callback)
             self._is_listening = False
             raise
             
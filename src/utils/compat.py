@@ -0,0 +1,49 @@
+"""
+Optional accelerators for Rex-Brain.
+Picks the fast implementation when its package is installed, the standard
+one otherwise (orjson and h2 are not bundled on Android).
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# HTTP/2 needs the optional h2 package; plain keep-alive HTTP/1.1 otherwise
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+        """Encode obj as UTF-8 JSON (compact, or indented by 2 spaces)."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else None)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Decode a JSON document."""
+        return orjson.loads(data)
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+        """Encode obj as UTF-8 JSON (compact, or indented by 2 spaces)."""
+        if indent:
+            return json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":"), default=str, ensure_ascii=False).encode("utf-8")
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Decode a JSON document."""
+        return json.loads(data)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode obj as compact JSON text."""
+    return dumps_bytes(obj).decode("utf-8")
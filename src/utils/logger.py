@@ -4,12 +4,27 @@ Logging utilities for Rex-Brain.
 
 import logging
 import sys
+import time
 from datetime import datetime
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 
 # Global log callback for UI
 _log_callback: Optional[Callable[[str, str], None]] = None
 
+# Map custom levels to standard levels
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "SUCCESS": logging.INFO,
+    "SPEECH": logging.INFO,
+    "ROBOT": logging.INFO,
+}
+
+# Last message logged by log_exception() and when (for rate limiting)
+_last_exception: Tuple[str, float] = ("", 0.0)
+
 
 def setup_logger(level: int = logging.INFO) -> logging.Logger:
     """Setup the main logger."""
@@ -40,27 +55,19 @@ def set_log_callback(callback: Callable[[str, str], None]):
     _log_callback = callback
 
 
-def log(message: str, level: str = "INFO"):
+def log(message: str, level: str = "INFO", exc_info: bool = False):
     """
     Log a message with the specified level.
     
     Levels: DEBUG, INFO, WARNING, ERROR, SUCCESS, SPEECH, ROBOT
+    
+    With exc_info=True the current exception's traceback is attached; it is
+    only formatted if a handler actually emits the record.
     """
     logger = logging.getLogger("rex")
     
-    # Map custom levels to standard levels
-    level_map = {
-        "DEBUG": logging.DEBUG,
-        "INFO": logging.INFO,
-        "WARNING": logging.WARNING,
-        "ERROR": logging.ERROR,
-        "SUCCESS": logging.INFO,
-        "SPEECH": logging.INFO,
-        "ROBOT": logging.INFO,
-    }
-    
-    std_level = level_map.get(level, logging.INFO)
-    logger.log(std_level, message)
+    std_level = LEVELS.get(level, logging.INFO)
+    logger.log(std_level, message, exc_info=exc_info)
     
     # Call UI callback if set
     if _log_callback:
@@ -70,6 +77,43 @@ def log(message: str, level: str = "INFO"):
             pass  # Don't let logging errors crash the app
 
 
+def log_exception(
+    message: str,
+    callback: Optional[Callable[[str, str], None]] = None,
+    interval: float = 1.0
+) -> bool:
+    """
+    Log an error message with the current exception's traceback.
+    
+    Use inside an except block instead of traceback.format_exc(). The same
+    message repeated within `interval` seconds is dropped, so a failing loop
+    can't flood the logs.
+    
+    Args:
+        message: Error message
+        callback: Optional UI log callback (receives the message only)
+        interval: Minimum seconds between two identical messages
+        
+    Returns:
+        True if the message was logged
+    """
+    global _last_exception
+    
+    now = time.monotonic()
+    last_message, last_time = _last_exception
+    if message == last_message and now - last_time < interval:
+        return False
+    _last_exception = (message, now)
+    
+    log(message, "ERROR", exc_info=True)
+    if callback:
+        try:
+            callback(message, "ERROR")
+        except Exception:
+            pass  # Don't let logging errors crash the app
+    return True
+
+
 def debug(message: str):
     """Log a debug message."""
     log(message, "DEBUG")